@@ -23,13 +23,16 @@ from .lsp_protocol_handler.server import (
     LanguageServerHandler,
     ProcessLaunchInfo,
 )
-from .multilspy_config import MultilspyConfig, Language
+from .multilspy_config import MultilspyConfig, Language, _coerce_language
 from .multilspy_exceptions import MultilspyException
 from .multilspy_utils import PathUtils, FileUtils, TextUtils
 from pathlib import PurePath
 from typing import AsyncIterator, Iterator, List, Dict, Optional, Union, Tuple, Any
 from .type_helpers import ensure_all_methods_implemented
 
+# Name of the threads running the private event loop of a SyncLanguageServer, which is stopped when its server exits
+_SYNC_LOOP_THREAD_NAME = "multilspy-sync-loop"
+
 
 @dataclasses.dataclass
 class LSPFileBuffer:
@@ -77,7 +80,7 @@ class LanguageServer:
             language = (
                 config.code_language
                 if isinstance(config.code_language, Language)
-                else Language(str(config.code_language).lower())
+                else _coerce_language(str(config.code_language))
             )
         except ValueError as exc:
             logger.log(f"Language {config.code_language} is not supported", logging.ERROR)
@@ -1000,7 +1003,7 @@ class SyncLanguageServer:
         :return: None
         """
         self.loop = asyncio.new_event_loop()
-        loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        loop_thread = threading.Thread(target=self.loop.run_forever, name=_SYNC_LOOP_THREAD_NAME, daemon=True)
         loop_thread.start()
         ctx = self.language_server.start_server()
         asyncio.run_coroutine_threadsafe(ctx.__aenter__(), loop=self.loop).result()
@@ -0,0 +1,126 @@
+"""
+Prepares a Solidity repository for the Nomic Foundation language server (@nomicfoundation/solidity-language-server).
+
+This module is only imported when MultilspyConfig.enable_nomic_lsp_setup is set.
+"""
+
+import logging
+import os
+import subprocess
+
+from multilspy.language_servers.solidity_language_server.solidity_language_server import (
+    _json_dumps,
+    _json_loads,
+    _which,
+)
+from multilspy.multilspy_logger import MultilspyLogger
+
+
+def setup_project_dependencies(logger: MultilspyLogger, repository_root_path: str) -> None:
+    """
+    Setup project dependencies (Hardhat) in the repository for Nomic Foundation LSP
+    """
+    logger.log("Setting up project dependencies for Nomic Foundation LSP...", logging.INFO)
+
+    npm_path = _which("npm")
+    if npm_path is None:
+        logger.log("npm not found, skipping project setup", logging.WARNING)
+        return
+
+    # Check if package.json exists in the repository
+    package_json_path = os.path.join(repository_root_path, "package.json")
+    if not os.path.exists(package_json_path):
+        logger.log("No package.json found, creating one with Hardhat dependency...", logging.INFO)
+        # Create a minimal package.json
+        package_json_content = {
+            "name": "solidity-project",
+            "version": "1.0.0",
+            "description": "Solidity project for multilspy",
+            "devDependencies": {
+                "hardhat": "^2.17.0",
+                "@nomicfoundation/hardhat-toolbox": "^3.0.0"
+            },
+            "scripts": {
+                "compile": "hardhat compile"
+            }
+        }
+
+        with open(package_json_path, "wb") as f:
+            f.write(_json_dumps(package_json_content))
+        logger.log("Created package.json with Hardhat dependency", logging.INFO)
+    else:
+        # Check if hardhat is already in dependencies
+        try:
+            with open(package_json_path, "rb") as f:
+                package_json_bytes = f.read()
+
+            # A project that already depends on Hardhat mentions both packages, so the JSON is only parsed
+            # when this cheap substring check is inconclusive
+            if b'"hardhat"' in package_json_bytes and b'"@nomicfoundation/hardhat-toolbox"' in package_json_bytes:
+                logger.log("Hardhat already found in package.json", logging.INFO)
+            else:
+                package_json = _json_loads(package_json_bytes)
+
+                dev_deps = package_json.get("devDependencies", {})
+                deps = package_json.get("dependencies", {})
+
+                if "hardhat" not in dev_deps and "hardhat" not in deps:
+                    logger.log("Adding Hardhat to existing package.json...", logging.INFO)
+                    if "devDependencies" not in package_json:
+                        package_json["devDependencies"] = {}
+                    package_json["devDependencies"]["hardhat"] = "^2.17.0"
+                    package_json["devDependencies"]["@nomicfoundation/hardhat-toolbox"] = "^3.0.0"
+
+                    with open(package_json_path, "wb") as f:
+                        f.write(_json_dumps(package_json))
+                    logger.log("Added Hardhat to package.json", logging.INFO)
+                else:
+                    logger.log("Hardhat already found in package.json", logging.INFO)
+
+        except Exception as exc:
+            logger.log(f"Error reading package.json: {exc}", logging.WARNING)
+            return
+
+    # Check if node_modules exists and has hardhat
+    node_modules_path = os.path.join(repository_root_path, "node_modules")
+    hardhat_path = os.path.join(node_modules_path, "hardhat")
+
+    if not os.path.exists(hardhat_path):
+        logger.log("Installing project dependencies (this may take a moment)...", logging.INFO)
+        try:
+            def run_npm_install(command, cwd: str):
+                logger.log(f"Running: {' '.join(command) if isinstance(command, list) else command}", logging.INFO)
+                # Only stderr is needed to report failures, so stdout is not buffered in memory
+                result = subprocess.run(
+                    command,
+                    cwd=cwd,
+                    shell=isinstance(command, str),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    check=False,
+                )
+                if result.returncode != 0:
+                    raise RuntimeError(f"Command failed: {result.stderr}")
+
+            run_npm_install([npm_path, "install"], repository_root_path)
+            logger.log("Project dependencies installed successfully", logging.INFO)
+        except Exception as exc:
+            logger.log(f"Failed to install project dependencies: {exc}", logging.WARNING)
+    else:
+        logger.log("Project dependencies already installed", logging.INFO)
+
+    # Create basic hardhat.config.js if it doesn't exist
+    hardhat_config_path = os.path.join(repository_root_path, "hardhat.config.js")
+    if not os.path.exists(hardhat_config_path):
+        logger.log("Creating basic hardhat.config.js...", logging.INFO)
+        hardhat_config_content = '''require("@nomicfoundation/hardhat-toolbox");
+
+/** @type import('hardhat/config').HardhatUserConfig */
+module.exports = {
+  solidity: "0.8.19",
+};
+'''
+        with open(hardhat_config_path, "w") as f:
+            f.write(hardhat_config_content)
+        logger.log("Created basic hardhat.config.js", logging.INFO)
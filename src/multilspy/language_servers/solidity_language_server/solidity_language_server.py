@@ -4,20 +4,411 @@ Contains various configurations and settings specific to Solidity.
 """
 
 import asyncio
+import atexit
+import collections
+import concurrent.futures
+import copy
+import dataclasses
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import os
 import pathlib
+import selectors
 import shutil
 import subprocess
+import threading
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from multilspy.language_server import LanguageServer
-from multilspy.lsp_protocol_handler.server import ProcessLaunchInfo
+import psutil
+
+from multilspy import multilspy_types
+from multilspy.language_server import _SYNC_LOOP_THREAD_NAME, LanguageServer
+from multilspy.lsp_protocol_handler.server import LanguageServerHandler, ProcessLaunchInfo
 from multilspy.multilspy_config import MultilspyConfig
 from multilspy.multilspy_logger import MultilspyLogger
-from multilspy.multilspy_utils import FileUtils, PlatformUtils
+from multilspy.multilspy_utils import FileUtils, PlatformId, PlatformUtils
+
+# orjson is an optional, faster drop-in for parsing and writing the JSON files handled here
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+# To switch between Solidity LSP implementations, change the filename here:
+# - "runtime_dependencies.json" for VSCode Solidity (juanfranblanco/vscode-solidity)
+# - "runtime_dependencies_nomic.json" for Nomic Foundation (@nomicfoundation/solidity-language-server)
+_RUNTIME_DEPS_PATH = os.path.join(_THIS_DIR, "runtime_dependencies_haoyang.json")
+_INIT_PARAMS_PATH = os.path.join(_THIS_DIR, "initialize_params.json")
+_SOLIDITY_LS_DIR = os.path.join(_THIS_DIR, "static", "vscode-solidity")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_runtime_deps() -> Dict[str, dict]:
+    """
+    Returns the bundled runtime dependencies indexed by platform id. The file is static, so it is parsed only once.
+    """
+    with open(_RUNTIME_DEPS_PATH, "rb") as f:
+        d = _json_loads(f.read())
+    return {dep["platformId"]: dep for dep in d["runtimeDependencies"]}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_initialize_params_template() -> dict:
+    """
+    Returns the bundled initialize params without their description. The file is static, so it is parsed only once.
+    The returned dict is shared between callers and must not be mutated.
+    """
+    with open(_INIT_PARAMS_PATH, "rb") as f:
+        d = _json_loads(f.read())
+    del d["_description"]
+    return d
+
+
+# Server script paths of completed setups keyed by (platform id, install directory, archive url). Node is not
+# cached here, it is looked up on PATH for every launch command.
+_SETUP_CACHE: Dict[Tuple[str, str, str], str] = {}
+_SETUP_LOCK = threading.Lock()
+
+_SEVERITY = ("Error", "Warning", "Info", "Hint")
+
+# Size of the chunks used to hash the npm manifests
+_HASH_CHUNK_SIZE = 1 << 16
+
+# Upper bound in seconds for a single install or build command
+_COMMAND_TIMEOUT = 1800
+
+# Upper bound in seconds for the language server to answer the shutdown request
+_SHUTDOWN_TIMEOUT = 5
+
+# Size of the reads used to drain the output of install and build commands
+_OUTPUT_CHUNK_SIZE = 1 << 16
+
+# Upper bound on the number of definition and references responses cached per server instance
+_RESPONSE_CACHE_SIZE = 512
+
+# Written next to package.json after a successful npm install, containing the digest of the npm manifests
+_INSTALL_MARKER = ".multilspy_install_ok"
+_NPM_MANIFESTS = ("package.json", "package-lock.json")
+
+# Written to the install directory after a successful setup, recording the server script path it resolved together
+# with a digest of the dependency spec it was resolved for
+_READY_MARKER = ".multilspy_ready.json"
+
+
+@functools.lru_cache(maxsize=8)
+def _which_cached(name: str, path_env: str) -> Optional[str]:
+    """
+    Memoized shutil.which. Taking {path_env} as an argument makes it part of the cache key, so lookups are redone
+    whenever PATH changes.
+    """
+    return shutil.which(name, path=path_env)
+
+
+def _which(name: str) -> Optional[str]:
+    """
+    Returns the path of the executable {name} found on PATH, or None if it is not found.
+    """
+    return _which_cached(name, os.environ.get("PATH", os.defpath))
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_platform_id() -> PlatformId:
+    """
+    Memoized PlatformUtils.get_platform_id, the platform cannot change while the process is running.
+    """
+    return PlatformUtils.get_platform_id()
+
+
+def _make_info_logger(logger: MultilspyLogger) -> Callable[[str], None]:
+    """
+    Returns a function logging its message at INFO level, or a no-op if such messages would not be emitted anyway.
+    """
+    if logger.is_enabled_for(logging.INFO):
+        return lambda message: logger.log(message, logging.INFO)
+    return lambda message: None
+
+
+def _kill_process_tree(process: subprocess.Popen) -> None:
+    """
+    Kills {process} along with its descendants, such as the npm processes started by a shell command.
+    """
+    try:
+        children = psutil.Process(process.pid).children(recursive=True)
+    except psutil.Error:
+        children = []
+    for child in children:
+        try:
+            child.kill()
+        except psutil.Error:
+            pass
+    process.kill()
+
+
+def _exists(path: str) -> bool:
+    """
+    Returns whether {path} exists, probing it with a single stat call.
+    """
+    try:
+        os.stat(path)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _is_empty_dir(path: str) -> bool:
+    """
+    Returns whether the directory at {path} is missing or empty, reading at most one of its entries.
+    """
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is None
+    except FileNotFoundError:
+        return True
+
+
+def _package_manifest_digest(install_path: str) -> str:
+    """
+    Returns the SHA256 digest of the npm manifests (package.json and package-lock.json) found in {install_path}.
+    """
+    digest = hashlib.sha256()
+    for manifest in _NPM_MANIFESTS:
+        digest.update(manifest.encode())
+        try:
+            with open(os.path.join(install_path, manifest), "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            continue
+    return digest.hexdigest()
+
+
+def _read_install_marker(marker_path: str) -> Optional[str]:
+    """
+    Returns the manifest digest recorded by the last successful npm install, or None if there is no marker.
+    """
+    try:
+        with open(marker_path, "r") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def _dependency_version(dependency: dict) -> str:
+    """
+    Returns a digest of the runtime dependency spec, which changes whenever the spec is edited.
+    """
+    return hashlib.sha1(json.dumps(dependency, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _read_ready_marker(marker_path: str, version: str) -> Optional[str]:
+    """
+    Returns the server script path recorded by a previous setup of the dependency spec with digest {version}, or None
+    if there is no usable record.
+    """
+    try:
+        with open(marker_path, "rb") as f:
+            ready = _json_loads(f.read())
+        if ready["version"] != version:
+            return None
+        server_script_path = ready["serverScript"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(server_script_path, str) or not _exists(server_script_path):
+        return None
+    return server_script_path
+
+
+def _write_ready_marker(marker_path: str, version: str, server_script_path: str) -> None:
+    """
+    Records the outcome of a successful setup, so that later processes can skip the setup entirely.
+    """
+    # Written to a temporary file that is renamed over the record, so that readers never see a partial record
+    tmp_path = f"{marker_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_json_dumps({"version": version, "serverScript": server_script_path}))
+        os.replace(tmp_path, marker_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@dataclasses.dataclass
+class _PooledServer:
+    """
+    An initialized Solidity language server process that is waiting to be reused.
+    """
+
+    server: LanguageServerHandler
+    registered_capabilities: Dict[str, str]
+    loop: asyncio.AbstractEventLoop
+    released_at: float
+
+
+class _LSPProcessPool:
+    """
+    Keeps initialized Solidity language server processes alive after their SolidityLanguageServer exits, so that a
+    later instance for the same repository and launch command can reuse them instead of starting and initializing
+    a new Node.js process.
+
+    asyncio subprocesses are bound to the event loop that created them, so pooled processes are only handed out
+    on that loop. Idle processes are stopped after {max_idle} seconds, and the oldest idle process is stopped when
+    more than {max_pool_size} are pooled. Processes whose event loop has stopped can no longer be shut down through
+    it, so they are killed on the next pool operation, or at interpreter exit at the latest.
+    """
+
+    def __init__(self, max_pool_size: int = 4, max_idle: float = 300) -> None:
+        self.max_pool_size = max_pool_size
+        self.max_idle = max_idle
+        self._idle: Dict[Tuple[str, Tuple[str, ...]], List[_PooledServer]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Tuple[str, Tuple[str, ...]]) -> Optional[_PooledServer]:
+        """
+        Removes and returns a live pooled server for {key} that belongs to the running event loop, if there is one.
+        """
+        loop = asyncio.get_running_loop()
+        self._kill_orphans()
+        with self._lock:
+            for entry in reversed(self._idle.get(key, [])):
+                if entry.loop is loop and entry.server.process is not None and entry.server.process.returncode is None:
+                    self._remove(entry)
+                    return entry
+        return None
+
+    def release(self, key: Tuple[str, Tuple[str, ...]], server: LanguageServerHandler, registered_capabilities: Dict[str, str]) -> None:
+        """
+        Returns an initialized server to the pool, stopping the oldest idle server if the pool is full.
+        """
+        loop = asyncio.get_running_loop()
+        self._kill_orphans()
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(key, []).append(_PooledServer(server, registered_capabilities, loop, time.monotonic()))
+            idle = sorted((entry for entries in self._idle.values() for entry in entries), key=lambda e: e.released_at)
+            for entry in idle[: max(0, len(idle) - self.max_pool_size)]:
+                self._remove(entry)
+                evicted.append(entry)
+        for entry in evicted:
+            self._stop(entry)
+        loop.call_later(self.max_idle, self.cull)
+
+    def cull(self) -> None:
+        """
+        Stops the pooled servers of the running event loop that have been idle for longer than {max_idle} seconds,
+        or whose process has exited.
+        """
+        loop = asyncio.get_running_loop()
+        self._kill_orphans()
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            for entries in self._idle.values():
+                for entry in entries:
+                    if entry.loop is not loop:
+                        continue
+                    if now - entry.released_at >= self.max_idle or entry.server.process is None or entry.server.process.returncode is not None:
+                        stale.append(entry)
+            for entry in stale:
+                self._remove(entry)
+        for entry in stale:
+            self._stop(entry)
+
+    async def close(self) -> None:
+        """
+        Shuts down and stops all pooled servers that belong to the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        self._kill_orphans()
+        with self._lock:
+            entries = [entry for entries in self._idle.values() for entry in entries if entry.loop is loop]
+            for entry in entries:
+                self._remove(entry)
+        for entry in entries:
+            await self._shutdown(entry.server)
+
+    def _remove(self, entry: _PooledServer) -> None:
+        for key, entries in list(self._idle.items()):
+            if entry in entries:
+                entries.remove(entry)
+                if not entries:
+                    del self._idle[key]
+                return
+
+    def kill_all(self) -> None:
+        """
+        Kills all pooled servers, whichever event loop they belong to. Registered to run at interpreter exit.
+        """
+        with self._lock:
+            entries = [entry for entries in self._idle.values() for entry in entries]
+            self._idle.clear()
+        for entry in entries:
+            self._kill(entry.server)
+
+    def _kill_orphans(self) -> None:
+        with self._lock:
+            orphans = [
+                entry for entries in self._idle.values() for entry in entries if not self._loop_is_alive(entry.loop)
+            ]
+            for entry in orphans:
+                self._remove(entry)
+        for entry in orphans:
+            self._kill(entry.server)
+
+    @staticmethod
+    def _loop_is_alive(loop: asyncio.AbstractEventLoop) -> bool:
+        return loop.is_running() and not loop.is_closed()
+
+    def _stop(self, entry: _PooledServer) -> None:
+        if not self._loop_is_alive(entry.loop):
+            self._kill(entry.server)
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if entry.loop is running_loop:
+            entry.loop.create_task(self._shutdown(entry.server))
+        else:
+            asyncio.run_coroutine_threadsafe(self._shutdown(entry.server), entry.loop)
+
+    @staticmethod
+    def _kill(server: LanguageServerHandler) -> None:
+        # Signalling goes through psutil, so it does not need the event loop the process was started on
+        process, server.process = server.process, None
+        if process is not None and process.returncode is None:
+            server._signal_process_tree(process, terminate=False)
+
+    @staticmethod
+    async def _shutdown(server: LanguageServerHandler) -> None:
+        try:
+            await asyncio.wait_for(server.shutdown(), timeout=_SHUTDOWN_TIMEOUT)
+        except Exception:
+            pass
+        finally:
+            await server.stop()
+
+
+_PROCESS_POOL = _LSPProcessPool()
+atexit.register(_PROCESS_POOL.kill_all)
 
 
 class SolidityLanguageServer(LanguageServer):
@@ -34,101 +425,180 @@ class SolidityLanguageServer(LanguageServer):
 
         # Store repository root for project setup
         self.repository_root_path = repository_root_path
-
-        executable_path = self.setup_runtime_dependencies(logger)
-
+        self.enable_nomic_lsp_setup = config.enable_nomic_lsp_setup
+        self.pool_lsp_process = config.pool_solidity_lsp_processes
+        self.parallel_npm_install = config.parallel_npm_install
+        self.cache_lsp_responses = config.cache_solidity_lsp_responses
+        # Responses keyed by (method, file, mtime, buffer contents digest, line, column), in least recently used order
+        self._response_cache: "collections.OrderedDict[tuple, List[multilspy_types.Location]]" = collections.OrderedDict()
+        self._inflight_requests: Dict[tuple, "asyncio.Task[List[multilspy_types.Location]]"] = {}
+
+        # The launch command is filled in by start_server, so that the runtime dependencies are only set up
+        # once the server is actually needed
         super().__init__(
             config,
             logger,
             repository_root_path,
-            ProcessLaunchInfo(cmd=executable_path, cwd=repository_root_path),
+            ProcessLaunchInfo(cmd=[], cwd=repository_root_path),
             "solidity",
         )
 
-    def setup_runtime_dependencies(self, logger: MultilspyLogger) -> str:
+    @functools.cached_property
+    def _executable_path(self) -> List[str]:
+        """
+        The arguments to launch the Solidity language server, setting up the runtime dependencies on first access.
+        """
+        return self.setup_runtime_dependencies(self.logger)
+
+    def setup_runtime_dependencies(self, logger: MultilspyLogger) -> List[str]:
         """
         Setup runtime dependencies for SolidityLanguageServer.
         """
-        logger.log("Setting up Solidity language server runtime dependencies...", logging.INFO)
+        log_info = _make_info_logger(logger)
+        log_info("Setting up Solidity language server runtime dependencies...")
+
+        platform_id = _cached_platform_id()
+        log_info(f"Detected platform: {platform_id.value}")
 
-        platform_id = PlatformUtils.get_platform_id()
-        logger.log(f"Detected platform: {platform_id.value}", logging.INFO)
+        # Find the dependency for the current platform
+        dependencies_by_platform = _load_runtime_deps()
+        dependency = dependencies_by_platform.get(platform_id.value)
+        if dependency is None:
+            raise RuntimeError(f"Unsupported platform: {platform_id.value}. Supported platforms: {list(dependencies_by_platform)}")
+
+        cache_key = (platform_id.value, _SOLIDITY_LS_DIR, dependency["url"])
+
+        with _SETUP_LOCK:
+            server_script_path = _SETUP_CACHE.get(cache_key)
+            if server_script_path is None or not _exists(server_script_path):
+                ready_marker_path = os.path.join(_SOLIDITY_LS_DIR, _READY_MARKER)
+                version = _dependency_version(dependency)
+                server_script_path = _read_ready_marker(ready_marker_path, version)
+                if server_script_path is None:
+                    # Only successful setups are cached, so a failed install is retried on the next instantiation
+                    server_script_path = self._install_runtime_dependencies(logger, dependency, _SOLIDITY_LS_DIR)
+                    try:
+                        _write_ready_marker(ready_marker_path, version, server_script_path)
+                    except OSError as exc:
+                        logger.log(f"Could not record the Solidity language server setup: {exc}", logging.WARNING)
+                else:
+                    log_info(f"Solidity language server already set up. Entry point: {server_script_path}")
+                _SETUP_CACHE[cache_key] = server_script_path
+            else:
+                log_info(f"Solidity language server already set up. Entry point: {server_script_path}")
 
-        node_path = shutil.which("node")
+        # Node is resolved on every call, so that switching Node.js versions (nvm, a changed PATH) takes effect
+        node_path = _which("node")
         if node_path is None:
             raise RuntimeError("Node.js is required to run the Solidity language server. Please install Node.js and try again.")
+        return [node_path, server_script_path, "--stdio"]
 
-        npm_path = shutil.which("npm")
-        if npm_path is None:
-            raise RuntimeError("npm is required to prepare the Solidity language server. Please install npm and try again.")
-
-        # To switch between Solidity LSP implementations, change the filename here:
-        # - "runtime_dependencies.json" for VSCode Solidity (juanfranblanco/vscode-solidity)
-        # - "runtime_dependencies_nomic.json" for Nomic Foundation (@nomicfoundation/solidity-language-server)
-        with open(os.path.join(os.path.dirname(__file__), "runtime_dependencies_haoyang.json"), "r") as f:
-            d = json.load(f)
-            del d["_description"]
+    def _install_runtime_dependencies(self, logger: MultilspyLogger, dependency: dict, solidity_ls_dir: str) -> str:
+        """
+        Downloads, installs and builds the Solidity language server described by {dependency} under {solidity_ls_dir}.
+        Returns the path of the server entry point.
+        """
+        log_info = _make_info_logger(logger)
 
-        # Check if platform is supported
-        supported_platforms = [dep["platformId"] for dep in d["runtimeDependencies"]]
-        if platform_id.value not in supported_platforms:
-            raise RuntimeError(f"Unsupported platform: {platform_id.value}. Supported platforms: {supported_platforms}")
+        if _which("node") is None:
+            raise RuntimeError("Node.js is required to run the Solidity language server. Please install Node.js and try again.")
 
-        # Find the dependency for the current platform
-        runtime_dependencies = d["runtimeDependencies"]
-        dependency = next((dep for dep in runtime_dependencies if dep["platformId"] == platform_id.value), None)
-        if dependency is None:
-            raise RuntimeError(f"No runtime dependency found for platform {platform_id.value}")
+        npm_path = _which("npm")
+        if npm_path is None:
+            raise RuntimeError("npm is required to prepare the Solidity language server. Please install npm and try again.")
 
         # Setup paths
-        solidity_ls_dir = os.path.join(os.path.dirname(__file__), "static", "vscode-solidity")
         os.makedirs(solidity_ls_dir, exist_ok=True)
 
-        primary_extraction_path = os.path.join(solidity_ls_dir, dependency["relative_extraction_path"])
-        server_script_relative_path = dependency["serverScript"]
-        server_script_parts = server_script_relative_path.split("/")
-        legacy_relative_paths = dependency.get("legacyRelativeExtractionPaths", [])
+        primary_extraction_path = f"{solidity_ls_dir}{os.sep}{dependency['relative_extraction_path']}"
+        server_script_relative_path = os.sep.join(dependency["serverScript"].split("/"))
+        candidate_relative_paths = [
+            dependency["relative_extraction_path"],
+            *dependency.get("legacyRelativeExtractionPaths", []),
+        ]
+
+        def log_output(output: bytes) -> None:
+            lines = output.decode("utf-8", errors="replace").rstrip().split("\n")
+            if lines != [""]:
+                logger.log_lines([line.rstrip() for line in lines], logging.INFO)
+
+        def drain_output(process: subprocess.Popen) -> None:
+            """
+            Logs the output of {process} in batches of complete lines as it arrives, until the process exits.
+            Raises subprocess.TimeoutExpired if that takes longer than _COMMAND_TIMEOUT.
+            """
+            if os.name == "nt":
+                # select() only works on sockets on Windows, so the output is collected in one piece there
+                output, _ = process.communicate(timeout=_COMMAND_TIMEOUT)
+                log_output(output)
+                return
+
+            deadline = time.monotonic() + _COMMAND_TIMEOUT
+            fd = process.stdout.fileno()
+            os.set_blocking(fd, False)
+            pending = b""
+            with selectors.DefaultSelector() as selector:
+                selector.register(fd, selectors.EVENT_READ)
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(process.args, _COMMAND_TIMEOUT)
+                    if not selector.select(remaining):
+                        continue
+                    try:
+                        chunk = os.read(fd, _OUTPUT_CHUNK_SIZE)
+                    except BlockingIOError:
+                        continue
+                    if not chunk:
+                        break
+                    # Only complete lines are logged, the trailing partial line waits for the next chunk
+                    complete, _, pending = (pending + chunk).rpartition(b"\n")
+                    if complete:
+                        log_output(complete)
+            if pending:
+                log_output(pending)
+            process.stdout.close()
+            process.wait(timeout=max(deadline - time.monotonic(), 0))
 
         def run_command_with_logging(command, cwd: str, use_shell: bool = False):
             display_cmd = command if isinstance(command, str) else " ".join(command)
-            logger.log(f"Executing command: {display_cmd}", logging.INFO)
+            log_info(f"Executing command: {display_cmd}")
+            verbose = logger.is_enabled_for(logging.INFO)
+            # Without logging, the output would be discarded anyway, so the child writes it straight to the null device
             process = subprocess.Popen(
                 command,
                 cwd=cwd,
                 shell=use_shell,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.PIPE if verbose else subprocess.DEVNULL,
                 stderr=subprocess.STDOUT,
-                text=True,
             )
-            assert process.stdout is not None
             try:
-                for line in process.stdout:
-                    logger.log(line.rstrip(), logging.INFO)
-            finally:
-                process.stdout.close()
-
-            exit_code = process.wait()
+                if verbose:
+                    drain_output(process)
+                else:
+                    process.wait(timeout=_COMMAND_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                _kill_process_tree(process)
+                process.wait()
+                raise RuntimeError(f"Command '{display_cmd}' timed out after {_COMMAND_TIMEOUT} seconds")
+            exit_code = process.returncode
             if exit_code != 0:
                 raise RuntimeError(f"Command '{display_cmd}' failed with exit code {exit_code}")
 
         def resolve_paths():
-            candidate_relative_paths = [dependency["relative_extraction_path"], *legacy_relative_paths]
             for relative_path in candidate_relative_paths:
-                candidate_extraction_path = os.path.join(solidity_ls_dir, relative_path)
-                candidate_server_path = os.path.join(candidate_extraction_path, *server_script_parts)
-                if os.path.exists(candidate_server_path):
+                candidate_extraction_path = f"{solidity_ls_dir}{os.sep}{relative_path}"
+                candidate_server_path = f"{candidate_extraction_path}{os.sep}{server_script_relative_path}"
+                if _exists(candidate_server_path):
                     return candidate_extraction_path, candidate_server_path
-            default_extraction_path = os.path.join(solidity_ls_dir, dependency["relative_extraction_path"])
-            default_server_path = os.path.join(default_extraction_path, *server_script_parts)
-            return default_extraction_path, default_server_path
+            return primary_extraction_path, f"{primary_extraction_path}{os.sep}{server_script_relative_path}"
 
         extraction_path, server_script_path = resolve_paths()
 
-        if not os.path.exists(server_script_path):
-            logger.log("Solidity language server entry point not found, preparing installation...", logging.INFO)
-            if not os.path.exists(primary_extraction_path):
-                logger.log("VSCode Solidity extension not found locally. Downloading archive...", logging.INFO)
-                logger.log(f"Download URL: {dependency['url']}", logging.INFO)
+        if not _exists(server_script_path):
+            log_info("Solidity language server entry point not found, preparing installation...")
+            if not _exists(primary_extraction_path):
+                log_info(f"VSCode Solidity extension not found locally. Downloading archive from {dependency['url']}...")
                 FileUtils.download_and_extract_archive(
                     logger, dependency["url"], solidity_ls_dir, dependency["archiveType"]
                 )
@@ -137,163 +607,96 @@ class SolidityLanguageServer(LanguageServer):
 
             extraction_path, server_script_path = resolve_paths()
 
-        if not os.path.exists(extraction_path):
+        if not _exists(extraction_path):
             raise FileNotFoundError(f"VSCode Solidity extension was not found at {extraction_path} after extraction")
 
-        npm_install_dirs = dependency.get("npmInstallDirs", [])
-        for relative_dir in npm_install_dirs:
+        def run_npm_install(install_path: str) -> None:
+            log_info(f"Installing npm dependencies in {install_path}...")
+            try:
+                run_command_with_logging([npm_path, "install"], install_path)
+                log_info(f"npm install completed successfully in {install_path}.")
+            except Exception as exc:
+                logger.log(f"npm install failed for {install_path}: {exc}", logging.ERROR)
+                raise RuntimeError(f"npm install failed in {install_path}") from exc
+            # npm install may rewrite package-lock.json, so the digest is taken after it finished
+            with open(os.path.join(install_path, _INSTALL_MARKER), "w") as f:
+                f.write(_package_manifest_digest(install_path))
+
+        pending_install_paths = []
+        for relative_dir in dependency.get("npmInstallDirs", []):
             install_path = os.path.join(extraction_path, relative_dir)
-            node_modules_path = os.path.join(install_path, "node_modules")
-            if not os.path.isdir(install_path):
-                raise FileNotFoundError(f"Expected npm install directory {install_path} does not exist")
-            if not os.path.exists(node_modules_path) or not os.listdir(node_modules_path):
-                logger.log(f"Installing npm dependencies in {install_path}...", logging.INFO)
-                try:
-                    run_command_with_logging([npm_path, "install"], install_path)
-                    logger.log("npm install completed successfully.", logging.INFO)
-                except Exception as exc:
-                    logger.log(f"npm install failed for {install_path}: {exc}", logging.ERROR)
-                    raise RuntimeError(f"npm install failed in {install_path}") from exc
+            # A single listing of the install directory answers whether it, node_modules and the marker exist
+            try:
+                with os.scandir(install_path) as it:
+                    entries = {entry.name: entry for entry in it}
+            except (FileNotFoundError, NotADirectoryError):
+                raise FileNotFoundError(f"Expected npm install directory {install_path} does not exist") from None
+            node_modules = entries.get("node_modules")
+            node_modules_populated = (
+                node_modules is not None and node_modules.is_dir() and not _is_empty_dir(node_modules.path)
+            )
+            installed_digest = (
+                _read_install_marker(entries[_INSTALL_MARKER].path) if _INSTALL_MARKER in entries else None
+            )
+            if node_modules_populated and installed_digest == _package_manifest_digest(install_path):
+                log_info(f"npm dependencies in {install_path} match the last install (hash match), skipping.")
+            elif node_modules_populated and installed_digest is None:
+                log_info(f"npm dependencies already installed in {install_path}, skipping.")
             else:
-                logger.log(f"npm dependencies already installed in {install_path}, skipping.", logging.INFO)
-
-        if not os.path.exists(server_script_path):
+                pending_install_paths.append(install_path)
+
+        # The install directories are independent packages, so their installs can run concurrently
+        if len(pending_install_paths) == 1 or not self.parallel_npm_install:
+            for install_path in pending_install_paths:
+                run_npm_install(install_path)
+        elif pending_install_paths:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(pending_install_paths))) as executor:
+                futures = [executor.submit(run_npm_install, install_path) for install_path in pending_install_paths]
+                for future in futures:
+                    future.result()
+
+        if not _exists(server_script_path):
             compile_command = dependency.get("compileCommand")
             compile_working_dir = dependency.get("compileWorkingDirectory", ".")
             if compile_command:
                 compile_path = os.path.join(extraction_path, compile_working_dir)
                 if not os.path.isdir(compile_path):
                     raise FileNotFoundError(f"Compile working directory {compile_path} does not exist")
-                logger.log(f"Building Solidity language server via '{compile_command}' in {compile_path}...", logging.INFO)
+                log_info(f"Building Solidity language server via '{compile_command}' in {compile_path}...")
                 try:
                     run_command_with_logging(compile_command, compile_path, use_shell=True)
-                    logger.log("Solidity language server build completed successfully.", logging.INFO)
+                    log_info("Solidity language server build completed successfully.")
                 except Exception as exc:
                     logger.log(f"Compilation command failed in {compile_path}: {exc}", logging.ERROR)
                     raise RuntimeError(f"Failed to compile Solidity language server in {compile_path}") from exc
 
-        if not os.path.exists(server_script_path):
+        if not _exists(server_script_path):
             raise FileNotFoundError(f"Solidity language server entry point not found at {server_script_path}")
 
-        logger.log(f"Solidity language server ready. Entry point: {server_script_path}", logging.INFO)
-
-        # Setup project dependencies for Nomic Foundation LSP
-        # self._setup_project_dependencies(logger)
-
-        quoted_node_path = f"\"{node_path}\""
-        quoted_server_path = f"\"{server_script_path}\""
-        return f"{quoted_node_path} {quoted_server_path} --stdio"
-
-    def _setup_project_dependencies(self, logger: MultilspyLogger) -> None:
-        """
-        Setup project dependencies (Hardhat) in the repository for Nomic Foundation LSP
-        """
-        logger.log("Setting up project dependencies for Nomic Foundation LSP...", logging.INFO)
-
-        npm_path = shutil.which("npm")
-        if npm_path is None:
-            logger.log("npm not found, skipping project setup", logging.WARNING)
-            return
-
-        # Check if package.json exists in the repository
-        package_json_path = os.path.join(self.repository_root_path, "package.json")
-        if not os.path.exists(package_json_path):
-            logger.log("No package.json found, creating one with Hardhat dependency...", logging.INFO)
-            # Create a minimal package.json
-            package_json_content = {
-                "name": "solidity-project",
-                "version": "1.0.0",
-                "description": "Solidity project for multilspy",
-                "devDependencies": {
-                    "hardhat": "^2.17.0",
-                    "@nomicfoundation/hardhat-toolbox": "^3.0.0"
-                },
-                "scripts": {
-                    "compile": "hardhat compile"
-                }
-            }
-
-            with open(package_json_path, "w") as f:
-                json.dump(package_json_content, f, indent=2)
-            logger.log("Created package.json with Hardhat dependency", logging.INFO)
-        else:
-            # Check if hardhat is already in dependencies
-            try:
-                with open(package_json_path, "r") as f:
-                    package_json = json.load(f)
-
-                dev_deps = package_json.get("devDependencies", {})
-                deps = package_json.get("dependencies", {})
-
-                if "hardhat" not in dev_deps and "hardhat" not in deps:
-                    logger.log("Adding Hardhat to existing package.json...", logging.INFO)
-                    if "devDependencies" not in package_json:
-                        package_json["devDependencies"] = {}
-                    package_json["devDependencies"]["hardhat"] = "^2.17.0"
-                    package_json["devDependencies"]["@nomicfoundation/hardhat-toolbox"] = "^3.0.0"
-
-                    with open(package_json_path, "w") as f:
-                        json.dump(package_json, f, indent=2)
-                    logger.log("Added Hardhat to package.json", logging.INFO)
-                else:
-                    logger.log("Hardhat already found in package.json", logging.INFO)
+        log_info(f"Solidity language server ready. Entry point: {server_script_path}")
 
-            except Exception as exc:
-                logger.log(f"Error reading package.json: {exc}", logging.WARNING)
-                return
-
-        # Check if node_modules exists and has hardhat
-        node_modules_path = os.path.join(self.repository_root_path, "node_modules")
-        hardhat_path = os.path.join(node_modules_path, "hardhat")
-
-        if not os.path.exists(hardhat_path):
-            logger.log("Installing project dependencies (this may take a moment)...", logging.INFO)
-            try:
-                def run_npm_install(command, cwd: str):
-                    import subprocess
-                    logger.log(f"Running: {' '.join(command) if isinstance(command, list) else command}", logging.INFO)
-                    result = subprocess.run(command, cwd=cwd, shell=isinstance(command, str), capture_output=True, text=True)
-                    if result.returncode != 0:
-                        raise RuntimeError(f"Command failed: {result.stderr}")
-                    return result.stdout
-
-                run_npm_install([npm_path, "install"], self.repository_root_path)
-                logger.log("Project dependencies installed successfully", logging.INFO)
-            except Exception as exc:
-                logger.log(f"Failed to install project dependencies: {exc}", logging.WARNING)
-        else:
-            logger.log("Project dependencies already installed", logging.INFO)
-
-        # Create basic hardhat.config.js if it doesn't exist
-        hardhat_config_path = os.path.join(self.repository_root_path, "hardhat.config.js")
-        if not os.path.exists(hardhat_config_path):
-            logger.log("Creating basic hardhat.config.js...", logging.INFO)
-            hardhat_config_content = '''require("@nomicfoundation/hardhat-toolbox");
-
-/** @type import('hardhat/config').HardhatUserConfig */
-module.exports = {
-  solidity: "0.8.19",
-};
-'''
-            with open(hardhat_config_path, "w") as f:
-                f.write(hardhat_config_content)
-            logger.log("Created basic hardhat.config.js", logging.INFO)
+        return server_script_path
 
     def _get_initialize_params(self, repository_absolute_path: str):
         """
         Returns the initialize params for the Solidity Language Server.
-        """
-        # Use corresponding initialize params file for the selected LSP
-        with open(os.path.join(os.path.dirname(__file__), "initialize_params.json"), "r") as f:
-            d = json.load(f)
 
-        del d["_description"]
+        Only the fields that depend on the repository are copied from the parsed template; the remaining nested
+        values (such as the client capabilities) are shared with it and must not be mutated.
+        """
+        template = _load_initialize_params_template()
+        d = dict(template)
 
         d["processId"] = os.getpid()
         d["rootPath"] = repository_absolute_path
-        d["rootUri"] = pathlib.Path(repository_absolute_path).as_uri()
-        d["workspaceFolders"][0]["uri"] = pathlib.Path(repository_absolute_path).as_uri()
-        d["workspaceFolders"][0]["name"] = os.path.basename(repository_absolute_path)
+        root_uri = pathlib.Path(repository_absolute_path).as_uri()
+        d["rootUri"] = root_uri
+        workspace_folder = dict(template["workspaceFolders"][0])
+        workspace_folder["uri"] = root_uri
+        # Unlike os.path.basename, this also names the folder when the path has a trailing separator
+        folder_path = repository_absolute_path if os.altsep is None else repository_absolute_path.replace(os.altsep, os.sep)
+        workspace_folder["name"] = folder_path.rstrip(os.sep).rpartition(os.sep)[2]
+        d["workspaceFolders"] = [workspace_folder, *template["workspaceFolders"][1:]]
 
         return d
 
@@ -311,48 +714,190 @@ module.exports = {
 
         async def publish_diagnostics(params):
             """Handle diagnostics published by the language server"""
-            if isinstance(params, dict) and 'uri' in params and 'diagnostics' in params:
-                uri = params['uri']
-                diagnostics = params['diagnostics']
-                if diagnostics:
-                    self.logger.log(f"Diagnostics for {uri}: {len(diagnostics)} issues found", logging.INFO)
-                    for diag in diagnostics[:5]:  # Log first 5 diagnostics to avoid spam
-                        message = diag.get('message', 'Unknown diagnostic')
-                        severity = diag.get('severity', 1)
-                        severity_name = ['Error', 'Warning', 'Info', 'Hint'][min(severity, 3)]
-                        line = diag.get('range', {}).get('start', {}).get('line', '?')
-                        self.logger.log(f"  Line {line}: {severity_name} - {message}", logging.INFO)
+            if not self.logger.is_enabled_for(logging.INFO) or not isinstance(params, dict):
+                return
+            uri = params.get("uri")
+            diagnostics = params.get("diagnostics")
+            if uri is None or not diagnostics:
+                return
+            # The whole notification is logged as one record, so the logging lock is taken once
+            lines = [f"Diagnostics for {uri}: {len(diagnostics)} issues found"]
+            append = lines.append
+            for diag in itertools.islice(diagnostics, 5):  # Log first 5 diagnostics to avoid spam
+                message = diag.get("message", "Unknown diagnostic")
+                # LSP severities are 1 (Error) to 4 (Hint)
+                severity_name = _SEVERITY[min(max(diag.get("severity", 1), 1), 4) - 1]
+                try:
+                    line = diag["range"]["start"]["line"]
+                except (KeyError, TypeError):
+                    line = "?"
+                append(f"  Line {line}: {severity_name} - {message}")
+            self.logger.log_lines(lines, logging.INFO)
+
+        # The setup may download, install and build for a long time, so it runs off the event loop to keep the
+        # other servers on the loop responsive
+        loop = asyncio.get_running_loop()
+        self.server.process_launch_info.cmd = await loop.run_in_executor(None, lambda: self._executable_path)
+        if self.enable_nomic_lsp_setup:
+            from multilspy.language_servers.solidity_language_server.nomic_project_setup import (
+                setup_project_dependencies,
+            )
+
+            await loop.run_in_executor(None, setup_project_dependencies, self.logger, self.repository_root_path)
+
+        # The event loop of a SyncLanguageServer is stopped as soon as its server exits, so a process pooled on it
+        # could never be reused
+        pool_process = self.pool_lsp_process
+        if pool_process and threading.current_thread().name == _SYNC_LOOP_THREAD_NAME:
+            self.logger.log(
+                "Solidity language server process pooling is not supported by SyncLanguageServer, disabling it",
+                logging.WARNING,
+            )
+            pool_process = False
+
+        pool_key = (self.repository_root_path, tuple(self.server.process_launch_info.cmd))
+        pooled = _PROCESS_POOL.acquire(pool_key) if pool_process else None
+        if pooled is not None:
+            # Take over the pooled handler, keeping this instance's LSP communication logger
+            pooled.server.logger = self.server.logger
+            self.server = pooled.server
+            self._registered_capabilities = dict(pooled.registered_capabilities)
+            self.server.on_request("client/registerCapability", self._handle_register_capability)
+            self.server.on_request("client/unregisterCapability", self._handle_unregister_capability)
+
+        # Responses from a previous run of the server are not carried over
+        self._response_cache.clear()
 
         self.server.on_notification("window/logMessage", window_log_message)
         self.server.on_notification("$/progress", do_nothing)
         self.server.on_notification("textDocument/publishDiagnostics", publish_diagnostics)
 
         async with super().start_server():
-            self.logger.log("Starting Solidity Language Server process", logging.INFO)
-            await self.server.start()
-            initialize_params = self._get_initialize_params(self.repository_root_path)
+            if pooled is not None:
+                self.logger.log("Reusing pooled Solidity Language Server process", logging.INFO)
+            else:
+                self.logger.log("Starting Solidity Language Server process", logging.INFO)
+                await self.server.start()
+                initialize_params = self._get_initialize_params(self.repository_root_path)
 
-            self.logger.log(
-                "Sending initialize request from LSP client to LSP server and awaiting response",
-                logging.INFO,
-            )
-            init_response = await self.server.send.initialize(initialize_params)
+                self.logger.log(
+                    "Sending initialize request from LSP client to LSP server and awaiting response",
+                    logging.INFO,
+                )
+                init_response = await self.server.send.initialize(initialize_params)
 
-            # Verify server capabilities
-            if "capabilities" not in init_response:
-                raise RuntimeError("Invalid initialize response from Solidity language server")
+                # Verify server capabilities
+                if "capabilities" not in init_response:
+                    raise RuntimeError("Invalid initialize response from Solidity language server")
 
-            capabilities = init_response["capabilities"]
-            self.logger.log(f"Solidity language server capabilities: {list(capabilities.keys())}", logging.INFO)
+                capabilities = init_response["capabilities"]
+                self.logger.log(f"Solidity language server capabilities: {list(capabilities.keys())}", logging.INFO)
 
-            self.server.notify.initialized({})
+                self.server.notify.initialized({})
             self.completions_available.set()
 
             yield self
 
-            try:
-                await asyncio.wait_for(self.server.shutdown(), timeout=5)
-            except asyncio.TimeoutError:
-                self.logger.log("Timed out waiting for Solidity language server to shutdown gracefully.", logging.WARNING)
-            finally:
-                await self.server.stop()
+            if not pool_process:
+                shutdown_task = asyncio.create_task(self.server.shutdown())
+                try:
+                    done, _ = await asyncio.wait({shutdown_task}, timeout=_SHUTDOWN_TIMEOUT)
+                    if not done:
+                        self.logger.log("Timed out waiting for Solidity language server to shutdown gracefully.", logging.WARNING)
+                finally:
+                    # A shutdown still in flight is abandoned rather than waited on, as stop() tears down the process
+                    shutdown_task.cancel()
+                    await self.server.stop()
+                # A cancelled task that has not unwound yet, as stop() may return without yielding, is not done
+                if shutdown_task.done() and not shutdown_task.cancelled():
+                    shutdown_task.result()
+
+        if pool_process:
+            # Released only now, so that the files opened by this instance have been closed on the server
+            _PROCESS_POOL.release(pool_key, self.server, self._registered_capabilities)
+
+    @staticmethod
+    async def close_pooled_processes() -> None:
+        """
+        Shuts down the Solidity language server processes pooled on the running event loop.
+        Only relevant when MultilspyConfig.pool_solidity_lsp_processes is set.
+        """
+        await _PROCESS_POOL.close()
+
+    def _response_cache_key(self, method: str, relative_file_path: str, line: int, column: int) -> Optional[tuple]:
+        """
+        Returns the response cache key of a {method} request, or None if the file cannot be stat'ed.
+        """
+        absolute_file_path = str(pathlib.PurePath(self.repository_root_path, relative_file_path))
+        try:
+            mtime = os.stat(absolute_file_path).st_mtime_ns
+        except OSError:
+            return None
+        # Unsaved edits are identified by the buffer contents rather than its version, as reopening a file resets
+        # the version, so a different edit of the reopened buffer could otherwise reuse the same key
+        buffer = self.open_file_buffers.get(pathlib.Path(absolute_file_path).as_uri())
+        contents_digest = hashlib.sha1(buffer.contents.encode("utf-8")).hexdigest() if buffer is not None else None
+        return (method, absolute_file_path, mtime, contents_digest, line, column)
+
+    async def _cached_request(
+        self, key: Optional[tuple], request: Callable[[], Awaitable[List[multilspy_types.Location]]]
+    ) -> List[multilspy_types.Location]:
+        """
+        Returns the cached response for {key}, or runs {request} to obtain it. Identical requests made while one is
+        already in flight wait for its response instead of being sent to the server again.
+        """
+        if key is None:
+            return await request()
+
+        # Every caller gets its own copy, so that mutating a returned location cannot corrupt the cached response
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            return copy.deepcopy(cached)
+
+        task = self._inflight_requests.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._inflight_requests[key] = task
+
+            def on_done(done_task: "asyncio.Task[List[multilspy_types.Location]]") -> None:
+                self._inflight_requests.pop(key, None)
+                # Only successful responses are cached, so a failed request is retried by the next caller
+                if done_task.cancelled() or done_task.exception() is not None:
+                    return
+                self._response_cache[key] = done_task.result()
+                if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+
+            task.add_done_callback(on_done)
+
+        # Shielded, so that a cancelled caller does not cancel the request for the others waiting on it
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def request_definition(
+        self, relative_file_path: str, line: int, column: int
+    ) -> List[multilspy_types.Location]:
+        """
+        Same as LanguageServer.request_definition, but served from the response cache when
+        MultilspyConfig.cache_solidity_lsp_responses is set.
+        """
+        if not self.cache_lsp_responses:
+            return await super().request_definition(relative_file_path, line, column)
+        return await self._cached_request(
+            self._response_cache_key("definition", relative_file_path, line, column),
+            functools.partial(super().request_definition, relative_file_path, line, column),
+        )
+
+    async def request_references(
+        self, relative_file_path: str, line: int, column: int
+    ) -> List[multilspy_types.Location]:
+        """
+        Same as LanguageServer.request_references, but served from the response cache when
+        MultilspyConfig.cache_solidity_lsp_responses is set.
+        """
+        if not self.cache_lsp_responses:
+            return await super().request_references(relative_file_path, line, column)
+        return await self._cached_request(
+            self._response_cache_key("references", relative_file_path, line, column),
+            functools.partial(super().request_references, relative_file_path, line, column),
+        )
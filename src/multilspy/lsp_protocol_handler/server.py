@@ -50,8 +50,9 @@ class ProcessLaunchInfo:
     This class is used to store the information required to launch a process.
     """
 
-    # The command to launch the process
-    cmd: str
+    # The command to launch the process. A string is run through the shell, while a list of arguments is
+    # executed directly without spawning a shell
+    cmd: Union[str, List[str]]
 
     # The environment variables to set for the process
     env: Dict[str, str] = dataclasses.field(default_factory=dict)
@@ -155,7 +156,7 @@ class LanguageServerHandler:
         send: A LspRequest object that can be used to send requests to the server and
             await for the responses.
         notify: A LspNotification object that can be used to send notifications to the server.
-        cmd: A string that represents the command to launch the language server process.
+        cmd: A string or a list of arguments that represents the command to launch the language server process.
         process: A subprocess.Popen object that represents the language server process.
         _received_shutdown: A boolean flag that indicates whether the client has received
             a shutdown request from the server.
@@ -186,7 +187,7 @@ class LanguageServerHandler:
     ) -> None:
         """
         Params:
-            cmd: A string that represents the command to launch the language server process.
+            cmd: A string or a list of arguments that represents the command to launch the language server process.
             logger: An optional function that takes two strings (source and destination) and
                 a payload dictionary, and logs the communication between the client and the server.
         """
@@ -214,15 +215,27 @@ class LanguageServerHandler:
         """
         child_proc_env = os.environ.copy()
         child_proc_env.update(self.process_launch_info.env)
-        self.process = await asyncio.create_subprocess_shell(
-            self.process_launch_info.cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stdin=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=child_proc_env,
-            cwd=self.process_launch_info.cwd,
-            start_new_session=self.start_independent_lsp_process,
-        )
+        cmd = self.process_launch_info.cmd
+        if isinstance(cmd, str):
+            self.process = await asyncio.create_subprocess_shell(
+                cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stdin=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=child_proc_env,
+                cwd=self.process_launch_info.cwd,
+                start_new_session=self.start_independent_lsp_process,
+            )
+        else:
+            self.process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stdin=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=child_proc_env,
+                cwd=self.process_launch_info.cwd,
+                start_new_session=self.start_independent_lsp_process,
+            )
 
         self.loop = asyncio.get_event_loop()
         self.tasks[self.task_counter] = self.loop.create_task(self.run_forever())
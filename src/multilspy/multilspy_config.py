@@ -2,8 +2,10 @@
 Configuration parameters for Multilspy.
 """
 
+import functools
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from typing import Tuple
 
 class Language(str, Enum):
     """
@@ -26,6 +28,21 @@ class Language(str, Enum):
     def __str__(self) -> str:
         return self.value
 
+@functools.lru_cache(maxsize=32)
+def _coerce_language(value: str) -> Language:
+    """
+    Returns the Language named by {value}, ignoring case. Raises ValueError for unsupported languages.
+    """
+    return Language(value.lower())
+
+@functools.lru_cache(maxsize=None)
+def _init_field_names(cls: type) -> Tuple[str, ...]:
+    """
+    Returns the names of the fields accepted by the constructor of the dataclass {cls}, including those added by
+    subclasses. Cached per class, so that from_dict does not introspect the class on every call.
+    """
+    return tuple(field.name for field in fields(cls) if field.init)
+
 @dataclass
 class MultilspyConfig:
     """
@@ -34,25 +51,27 @@ class MultilspyConfig:
     code_language: Language
     trace_lsp_communication: bool = False
     start_independent_lsp_process: bool = True
+    enable_nomic_lsp_setup: bool = False
+    pool_solidity_lsp_processes: bool = False
+    parallel_npm_install: bool = True
+    # Reuses definition/references responses for unchanged files; references that live in other files may go stale
+    cache_solidity_lsp_responses: bool = False
 
     @classmethod
     def from_dict(cls, env: dict):
         """
         Create a MultilspyConfig instance from a dictionary
         """
-        import inspect
-
         kwargs = {}
-        signature = inspect.signature(cls).parameters
 
-        for key in signature:
+        for key in _init_field_names(cls):
             if key not in env:
                 continue
             value = env[key]
             if key == "code_language":
                 if isinstance(value, str):
                     try:
-                        value = Language(value.lower())
+                        value = _coerce_language(value)
                     except ValueError as exc:
                         raise ValueError(f"Unsupported language '{value}'") from exc
                 elif not isinstance(value, Language):
@@ -5,8 +5,12 @@ import inspect
 import json
 import logging
 from datetime import datetime
+from typing import Iterable
 from typing_extensions import TypedDict
 
+# Quotes are normalized and newlines flattened so that every message stays on a single log line
+_LOG_TRANS = str.maketrans({"'": '"', "\n": " "})
+
 class LogLine(TypedDict):
     """
     Represents a line in the Multilspy log
@@ -35,16 +39,28 @@ class MultilspyLogger:
             self.logger.addHandler(handler)
         self.logger.propagate = False
 
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Returns whether a message of the given level would be emitted by the logger
+        """
+        return self.verbose and self.logger.isEnabledFor(level)
+
     def log(self, debug_message: str, level: int, sanitized_error_message: str = "") -> None:
         """
         Log the debug and santized messages using the logger
         """
 
-        # Skip logging if verbose is False and this is not an error
-        if not self.verbose:
+        # Skip logging if verbose is False or the level is disabled, before any work is done on the messages
+        if not self.is_enabled_for(level):
             return
 
-        debug_message = debug_message.replace("'", '"').replace("\n", " ")
-        sanitized_error_message = sanitized_error_message.replace("'", '"').replace("\n", " ")
+        self.logger.log(level=level, msg=debug_message.translate(_LOG_TRANS))
+
+    def log_lines(self, lines: Iterable[str], level: int) -> None:
+        """
+        Log several lines as a single record, keeping each of them on its own line
+        """
+        if not self.is_enabled_for(level):
+            return
 
-        self.logger.log(level=level, msg=debug_message)
+        self.logger.log(level=level, msg="\n".join(line.translate(_LOG_TRANS) for line in lines))
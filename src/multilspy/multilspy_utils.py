@@ -8,17 +8,24 @@ import os
 from typing import Tuple, Union
 import requests
 import shutil
-import uuid
+import tarfile
+import tempfile
 import time
+import zipfile
 
 import platform
 import subprocess
 from enum import Enum
 
 from multilspy.multilspy_exceptions import MultilspyException
-from pathlib import PurePath, Path
+from pathlib import PurePath
 from multilspy.multilspy_logger import MultilspyLogger
 
+# tarfile stream modes for the tarball formats understood by shutil.unpack_archive
+_TAR_STREAM_MODES = {"tar": "r|", "gztar": "r|gz", "bztar": "r|bz2", "xztar": "r|xz"}
+
+_ARCHIVE_CHUNK_SIZE = 1024 * 1024
+
 class TextUtils:
     """
     Utilities for text operations.
@@ -152,46 +159,68 @@ class FileUtils:
             logger.log(f"Error downloading file '{url}': {exc}", logging.ERROR)
             raise MultilspyException("Error downoading file.") from None
 
+    @staticmethod
+    def open_download_stream(logger: MultilspyLogger, url: str) -> requests.Response:
+        """
+        Starts downloading the given URL and returns the streaming response, without reading its body
+        """
+        logger.log(f"Downloading file: {url}", logging.INFO)
+        response = requests.get(url, stream=True, timeout=60)
+        if response.status_code != 200:
+            logger.log(f"Error downloading file '{url}': {response.status_code} {response.text}", logging.ERROR)
+            response.close()
+            raise MultilspyException("Error downoading file.")
+        # Undo any Content-Encoding applied by the server, so that the raw stream yields the archive bytes
+        response.raw.decode_content = True
+        return response
+
     @staticmethod
     def download_and_extract_archive(logger: MultilspyLogger, url: str, target_path: str, archive_type: str) -> None:
         """
         Downloads the archive from the given URL having format {archive_type} and extracts it to the given {target_path}
+
+        The archive is extracted while it is being downloaded, instead of being written to a temporary file first.
+        Tarballs and gz files are decompressed as a stream. Zip archives need random access, so they are buffered
+        in an anonymous temporary file under ~/multilspy_tmp, which is removed as soon as it is closed.
         """
         try:
-            tmp_files = []
-            tmp_file_name = str(PurePath(os.path.expanduser("~"), "multilspy_tmp", uuid.uuid4().hex))
-            tmp_files.append(tmp_file_name)
-            os.makedirs(os.path.dirname(tmp_file_name), exist_ok=True)
-
             logger.log(f"Preparing archive from {url}", logging.INFO)
 
-            FileUtils.download_file(logger, url, tmp_file_name)
-
-            if archive_type in ["zip", "tar", "gztar", "bztar", "xztar"]:
+            if archive_type in ["tar", "gztar", "bztar", "xztar"]:
                 assert os.path.isdir(target_path)
-                shutil.unpack_archive(tmp_file_name, target_path, archive_type)
-            elif archive_type == "zip.gz":
+                with FileUtils.open_download_stream(logger, url) as response:
+                    with tarfile.open(fileobj=response.raw, mode=_TAR_STREAM_MODES[archive_type]) as tar:
+                        if hasattr(tarfile, "data_filter"):
+                            tar.extractall(target_path, filter="data")
+                        else:
+                            tar.extractall(target_path)
+            elif archive_type in ["zip", "zip.gz"]:
                 assert os.path.isdir(target_path)
-                tmp_file_name_ungzipped = tmp_file_name + ".zip"
-                tmp_files.append(tmp_file_name_ungzipped)
-                with gzip.open(tmp_file_name, "rb") as f_in, open(tmp_file_name_ungzipped, "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-                shutil.unpack_archive(tmp_file_name_ungzipped, target_path, "zip")
+                tmp_dir = str(PurePath(os.path.expanduser("~"), "multilspy_tmp"))
+                os.makedirs(tmp_dir, exist_ok=True)
+                # SpooledTemporaryFile is not usable here, as zipfile needs seekable(), which it lacks before 3.11
+                with tempfile.TemporaryFile(dir=tmp_dir) as archive:
+                    with FileUtils.open_download_stream(logger, url) as response:
+                        if archive_type == "zip.gz":
+                            with gzip.GzipFile(fileobj=response.raw) as f_in:
+                                shutil.copyfileobj(f_in, archive, _ARCHIVE_CHUNK_SIZE)
+                        else:
+                            shutil.copyfileobj(response.raw, archive, _ARCHIVE_CHUNK_SIZE)
+                    archive.seek(0)
+                    with zipfile.ZipFile(archive) as zip_file:
+                        zip_file.extractall(target_path)
             elif archive_type == "gz":
-                with gzip.open(tmp_file_name, "rb") as f_in, open(target_path, "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+                with FileUtils.open_download_stream(logger, url) as response:
+                    with gzip.GzipFile(fileobj=response.raw) as f_in, open(target_path, "wb") as f_out:
+                        shutil.copyfileobj(f_in, f_out, _ARCHIVE_CHUNK_SIZE)
             else:
                 logger.log(f"Unknown archive type '{archive_type}' for extraction", logging.ERROR)
                 raise MultilspyException(f"Unknown archive type '{archive_type}'")
+            logger.log(f"Download completed: {url}", logging.INFO)
             logger.log(f"Archive prepared at: {target_path}", logging.INFO)
         except Exception as exc:
-            logger.log(f"Error extracting archive '{tmp_file_name}' obtained from '{url}': {exc}", logging.ERROR)
+            logger.log(f"Error extracting archive obtained from '{url}': {exc}", logging.ERROR)
             raise MultilspyException("Error extracting archive.") from exc
-        finally:
-            for tmp_file_name in tmp_files:
-                if os.path.exists(tmp_file_name):
-                    Path.unlink(Path(tmp_file_name))
-                    logger.log(f"Cleaned up temporary file: {os.path.basename(tmp_file_name)}", logging.DEBUG)
 
 class PlatformId(str, Enum):
     """
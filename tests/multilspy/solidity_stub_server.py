@@ -0,0 +1,83 @@
+"""
+Provides a stub LSP server script standing in for the Solidity language server in offline tests.
+"""
+
+import pathlib
+import sys
+from typing import List
+
+import psutil
+
+# Answers initialize with empty capabilities and every other request with null, and exits on the exit notification.
+# Two extra requests let tests drive it: stub/stats returns how often it was initialized together with its pid, and
+# stub/register sends a window/logMessage notification and a client/registerCapability request for params["id"],
+# answering only once the client has answered the registration.
+STUB_SERVER = r"""
+import json, os, sys
+stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+initialize_count = 0
+next_request_id = 1
+deferred = {}
+
+def send(message):
+    body = json.dumps(dict(message, jsonrpc="2.0")).encode()
+    stdout.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stdout.flush()
+
+while True:
+    line = stdin.readline()
+    if not line:
+        break
+    if not line.startswith(b"Content-Length"):
+        continue
+    length = int(line.split(b":")[1])
+    while stdin.readline().strip():
+        pass
+    message = json.loads(stdin.read(length))
+    method = message.get("method")
+    if method == "exit":
+        break
+    if method is None:
+        if message.get("id") in deferred:
+            send({"id": deferred.pop(message["id"]), "result": None})
+        continue
+    if "id" not in message:
+        continue
+    result = None
+    if method == "initialize":
+        initialize_count += 1
+        result = {"capabilities": {}}
+    elif method == "stub/stats":
+        result = {"initializeCount": initialize_count, "pid": os.getpid()}
+    elif method == "stub/register":
+        capability_id = message["params"]["id"]
+        send({"method": "window/logMessage", "params": {"type": 3, "message": "registering " + capability_id}})
+        send({"id": next_request_id, "method": "client/registerCapability",
+              "params": {"registrations": [{"id": capability_id, "method": "workspace/stub"}]}})
+        deferred[next_request_id] = message["id"]
+        next_request_id += 1
+        continue
+    send({"id": message["id"], "result": result})
+"""
+
+
+def write_stub_server(directory: pathlib.Path) -> List[str]:
+    """
+    Writes the stub server script to {directory} and returns the command launching it
+    """
+    script = directory / "stub_server.py"
+    script.write_text(STUB_SERVER)
+    return [sys.executable, str(script)]
+
+
+def wait_for_exit(pid: int, timeout: float = 15) -> bool:
+    """
+    Waits for the process {pid} to exit, returning False if it is still running after {timeout} seconds
+    """
+    try:
+        psutil.Process(pid).wait(timeout=timeout)
+    except psutil.NoSuchProcess:
+        pass
+    except psutil.TimeoutExpired:
+        return False
+    return True
@@ -0,0 +1,37 @@
+"""
+This file contains tests for MultilspyConfig
+"""
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from multilspy.multilspy_config import Language, MultilspyConfig
+
+
+def test_from_dict() -> None:
+    """
+    Test that from_dict coerces the language name and ignores unknown keys
+    """
+    config = MultilspyConfig.from_dict({"code_language": "Solidity", "trace_lsp_communication": True, "unknown": 1})
+    assert config.code_language == Language.SOLIDITY
+    assert config.trace_lsp_communication
+    with pytest.raises(ValueError):
+        MultilspyConfig.from_dict({"code_language": "cobol"})
+
+
+def test_from_dict_on_subclass() -> None:
+    """
+    Test that from_dict on a subclass also fills the fields added by the subclass, but not its non-init fields
+    """
+
+    @dataclass
+    class ExtendedConfig(MultilspyConfig):
+        extra_option: int = 0
+        derived: int = field(default=0, init=False)
+
+    config = ExtendedConfig.from_dict({"code_language": "python", "extra_option": 3, "derived": 4})
+    assert isinstance(config, ExtendedConfig)
+    assert config.extra_option == 3
+    assert config.derived == 0
+    assert not hasattr(MultilspyConfig.from_dict({"code_language": "python", "extra_option": 3}), "extra_option")
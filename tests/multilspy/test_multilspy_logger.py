@@ -0,0 +1,61 @@
+"""
+This file contains tests for MultilspyLogger
+"""
+
+import logging
+from typing import Iterator, List
+
+import pytest
+
+from multilspy.multilspy_logger import MultilspyLogger
+
+
+class ListHandler(logging.Handler):
+    """
+    Collects the messages of the emitted records
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def records() -> Iterator[List[str]]:
+    handler = ListHandler()
+    multilspy_logger = logging.getLogger("multilspy")
+    multilspy_logger.addHandler(handler)
+    try:
+        yield handler.messages
+    finally:
+        multilspy_logger.removeHandler(handler)
+
+
+def test_log_flattens_message(records) -> None:
+    """
+    Test that log normalizes quotes and keeps the message on a single line
+    """
+    MultilspyLogger(verbose=True).log("it's\nmultiline", logging.INFO)
+    assert records == ['it"s multiline']
+
+
+def test_log_lines_keeps_lines(records) -> None:
+    """
+    Test that log_lines emits a single record with one line per input line
+    """
+    MultilspyLogger(verbose=True).log_lines(["header", "  it's line 1", "  line 2"], logging.INFO)
+    assert records == ['header\n  it"s line 1\n  line 2']
+
+
+def test_disabled_levels_are_skipped(records) -> None:
+    """
+    Test that nothing is emitted when verbose is off or the level is disabled
+    """
+    MultilspyLogger(verbose=False).log("hidden", logging.ERROR)
+    MultilspyLogger(verbose=False).log_lines(["hidden"], logging.ERROR)
+    MultilspyLogger(verbose=True).log("hidden", logging.DEBUG)
+    MultilspyLogger(verbose=True).log_lines(["hidden"], logging.DEBUG)
+    assert records == []
@@ -0,0 +1,106 @@
+"""
+This file contains offline tests for the archive download and extraction in multilspy_utils
+"""
+
+import functools
+import gzip
+import http.server
+import io
+import os
+import tarfile
+import threading
+import zipfile
+from typing import Iterator
+
+import pytest
+
+from multilspy.multilspy_exceptions import MultilspyException
+from multilspy.multilspy_logger import MultilspyLogger
+from multilspy.multilspy_utils import FileUtils
+
+FILES = {"pkg/server.js": b"console.log('hello');\n", "pkg/nested/data.txt": b"x" * 100_000}
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Serves files from a directory without logging every request
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def archive_server(tmp_path) -> Iterator[str]:
+    """
+    Serves a directory holding the same files packed as zip, zip.gz, gztar and gz, and yields its base url
+    """
+    serve_dir = tmp_path / "serve"
+    serve_dir.mkdir()
+
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, data in FILES.items():
+            zip_file.writestr(name, data)
+    (serve_dir / "archive.zip").write_bytes(zip_buffer.getvalue())
+    (serve_dir / "archive.zip.gz").write_bytes(gzip.compress(zip_buffer.getvalue()))
+
+    with tarfile.open(serve_dir / "archive.tar.gz", "w:gz") as tar:
+        for name, data in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+    (serve_dir / "server.js.gz").write_bytes(gzip.compress(FILES["pkg/server.js"]))
+
+    handler = functools.partial(QuietHandler, directory=str(serve_dir))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def assert_extracted(target_dir) -> None:
+    for name, data in FILES.items():
+        with open(os.path.join(target_dir, *name.split("/")), "rb") as f:
+            assert f.read() == data
+
+
+@pytest.mark.parametrize(
+    "file_name, archive_type",
+    [("archive.zip", "zip"), ("archive.zip.gz", "zip.gz"), ("archive.tar.gz", "gztar")],
+)
+def test_download_and_extract_archive(archive_server, tmp_path, file_name, archive_type) -> None:
+    """
+    Test that the archive types with multiple members are extracted into the target directory
+    """
+    target_dir = tmp_path / "out"
+    target_dir.mkdir()
+    FileUtils.download_and_extract_archive(
+        MultilspyLogger(), f"{archive_server}/{file_name}", str(target_dir), archive_type
+    )
+    assert_extracted(target_dir)
+
+
+def test_download_and_extract_gz(archive_server, tmp_path) -> None:
+    """
+    Test that a gz download is decompressed into the target file
+    """
+    target_file = tmp_path / "server.js"
+    FileUtils.download_and_extract_archive(MultilspyLogger(), f"{archive_server}/server.js.gz", str(target_file), "gz")
+    assert target_file.read_bytes() == FILES["pkg/server.js"]
+
+
+def test_download_and_extract_errors(archive_server, tmp_path) -> None:
+    """
+    Test that unknown archive types and failed downloads raise MultilspyException
+    """
+    with pytest.raises(MultilspyException):
+        FileUtils.download_and_extract_archive(MultilspyLogger(), f"{archive_server}/archive.zip", str(tmp_path), "rar")
+    with pytest.raises(MultilspyException):
+        FileUtils.download_and_extract_archive(MultilspyLogger(), f"{archive_server}/missing.zip", str(tmp_path), "zip")
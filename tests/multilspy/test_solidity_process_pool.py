@@ -0,0 +1,158 @@
+"""
+This file contains offline tests for the pool of Solidity language server processes, using a stub LSP server
+"""
+
+import asyncio
+import threading
+
+import psutil
+import pytest
+
+from multilspy.language_servers.solidity_language_server.solidity_language_server import _LSPProcessPool
+from multilspy.lsp_protocol_handler.server import LanguageServerHandler, ProcessLaunchInfo
+from solidity_stub_server import wait_for_exit, write_stub_server
+
+KEY = ("/repo", ("node", "server.js", "--stdio"))
+OTHER_KEY = ("/other", ("node", "server.js", "--stdio"))
+
+
+@pytest.fixture
+def stub_server_cmd(tmp_path):
+    return write_stub_server(tmp_path)
+
+
+async def start_handler(cmd) -> LanguageServerHandler:
+    handler = LanguageServerHandler(ProcessLaunchInfo(cmd=cmd, cwd="."))
+    await handler.start()
+    return handler
+
+
+async def finish_shutdowns() -> None:
+    # Waits for the shutdown tasks the pool scheduled on the running loop, so that none is pending when it is closed
+    await asyncio.gather(*(task for task in asyncio.all_tasks() if task.get_coro().__name__ == "_shutdown"))
+
+
+def close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    # Lets the loop notice that the killed process has exited and release its pipes before it is closed
+    loop.run_until_complete(asyncio.sleep(0.5))
+    loop.close()
+
+
+async def test_acquire_returns_released_server(stub_server_cmd) -> None:
+    """
+    Test that a released server is handed out again for its key only
+    """
+    pool = _LSPProcessPool()
+    handler = await start_handler(stub_server_cmd)
+    pool.release(KEY, handler, {"id": "method"})
+
+    assert pool.acquire(OTHER_KEY) is None
+    entry = pool.acquire(KEY)
+    assert entry is not None
+    assert entry.server is handler
+    assert entry.registered_capabilities == {"id": "method"}
+    assert pool.acquire(KEY) is None
+
+    await _LSPProcessPool._shutdown(handler)
+
+
+async def test_release_evicts_oldest_server(stub_server_cmd) -> None:
+    """
+    Test that the oldest idle server is stopped when the pool is full
+    """
+    pool = _LSPProcessPool(max_pool_size=1)
+    first = await start_handler(stub_server_cmd)
+    second = await start_handler(stub_server_cmd)
+    first_pid = first.process.pid
+
+    pool.release(KEY, first, {})
+    pool.release(KEY, second, {})
+    await asyncio.sleep(0)
+
+    assert await asyncio.get_running_loop().run_in_executor(None, wait_for_exit, first_pid)
+    await finish_shutdowns()
+    entry = pool.acquire(KEY)
+    assert entry is not None and entry.server is second
+    await pool.close()
+    await _LSPProcessPool._shutdown(second)
+
+
+async def test_cull_stops_idle_servers(stub_server_cmd) -> None:
+    """
+    Test that servers idle for longer than max_idle are stopped by cull
+    """
+    pool = _LSPProcessPool(max_idle=0)
+    handler = await start_handler(stub_server_cmd)
+    pid = handler.process.pid
+    pool.release(KEY, handler, {})
+
+    pool.cull()
+    await asyncio.sleep(0)
+
+    assert pool.acquire(KEY) is None
+    assert await asyncio.get_running_loop().run_in_executor(None, wait_for_exit, pid)
+    await finish_shutdowns()
+
+
+async def test_close_stops_pooled_servers(stub_server_cmd) -> None:
+    """
+    Test that close shuts down the pooled servers of the running event loop
+    """
+    pool = _LSPProcessPool()
+    handler = await start_handler(stub_server_cmd)
+    pid = handler.process.pid
+    pool.release(KEY, handler, {})
+
+    await pool.close()
+
+    assert pool.acquire(KEY) is None
+    assert await asyncio.get_running_loop().run_in_executor(None, wait_for_exit, pid)
+    await finish_shutdowns()
+
+
+def test_servers_of_stopped_loops_are_killed(stub_server_cmd) -> None:
+    """
+    Test that a server pooled on an event loop that has since stopped is killed by the next pool operation
+    """
+    pool = _LSPProcessPool()
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+
+    async def start_and_release():
+        handler = await start_handler(stub_server_cmd)
+        pool.release(KEY, handler, {})
+        return handler.process.pid
+
+    pid = asyncio.run_coroutine_threadsafe(start_and_release(), loop).result(timeout=30)
+    loop.call_soon_threadsafe(loop.stop)
+    loop_thread.join()
+    assert psutil.pid_exists(pid)
+
+    async def acquire():
+        return pool.acquire(KEY)
+
+    assert asyncio.run(acquire()) is None
+    assert wait_for_exit(pid)
+    assert pool._idle == {}
+    close_loop(loop)
+
+
+def test_kill_all_stops_every_server(stub_server_cmd) -> None:
+    """
+    Test that kill_all, which runs at interpreter exit, kills pooled servers without needing their event loop
+    """
+    pool = _LSPProcessPool()
+    loop = asyncio.new_event_loop()
+
+    async def start_and_release():
+        handler = await start_handler(stub_server_cmd)
+        pool.release(KEY, handler, {})
+        return handler.process.pid
+
+    pid = loop.run_until_complete(start_and_release())
+    pool.kill_all()
+
+    assert wait_for_exit(pid)
+    assert pool._idle == {}
+    close_loop(loop)
@@ -0,0 +1,215 @@
+"""
+This file contains offline tests for the definition and references response cache of SolidityLanguageServer.
+The requests to the language server are replaced by a stub of LanguageServer.request_definition.
+"""
+
+import asyncio
+import os
+import pathlib
+from types import SimpleNamespace
+
+import pytest
+
+from multilspy.language_server import LanguageServer, LSPFileBuffer
+from multilspy.language_servers.solidity_language_server import solidity_language_server
+from multilspy.language_servers.solidity_language_server.solidity_language_server import SolidityLanguageServer
+from multilspy.multilspy_config import MultilspyConfig
+from multilspy.multilspy_logger import MultilspyLogger
+
+
+class StubRequests:
+    """
+    Replaces LanguageServer.request_definition and request_references, counting the requests that reach them
+    """
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.fail_next = False
+        self.release = None
+
+    async def __call__(self, relative_file_path, line, column):
+        self.calls.append((relative_file_path, line, column))
+        if self.release is not None:
+            await self.release.wait()
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("request failed")
+        return [{"uri": "file:///contract.sol", "range": {"start": {"line": line, "character": column}}}]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "contract.sol").write_text("contract A {}\n")
+    return tmp_path
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    requests = StubRequests()
+
+    async def request(self, relative_file_path, line, column):
+        return await requests(relative_file_path, line, column)
+
+    monkeypatch.setattr(LanguageServer, "request_definition", request)
+    monkeypatch.setattr(LanguageServer, "request_references", request)
+    return requests
+
+
+def make_server(repo, cache: bool = True) -> SolidityLanguageServer:
+    config = MultilspyConfig.from_dict({"code_language": "solidity", "cache_solidity_lsp_responses": cache})
+    return SolidityLanguageServer(config, MultilspyLogger(), str(repo))
+
+
+async def test_repeated_requests_are_cached(repo, stub) -> None:
+    """
+    Test that identical requests reach the server once, while other positions and methods do not share entries
+    """
+    server = make_server(repo)
+    first = await server.request_definition("contract.sol", 0, 9)
+    assert await server.request_definition("contract.sol", 0, 9) == first
+    assert len(stub.calls) == 1
+
+    await server.request_definition("contract.sol", 0, 10)
+    await server.request_references("contract.sol", 0, 9)
+    assert len(stub.calls) == 3
+
+
+async def test_cache_disabled(repo, stub) -> None:
+    """
+    Test that every request reaches the server when the cache is not enabled
+    """
+    server = make_server(repo, cache=False)
+    await server.request_definition("contract.sol", 0, 9)
+    await server.request_definition("contract.sol", 0, 9)
+    assert len(stub.calls) == 2
+
+
+async def test_modified_file_is_requested_again(repo, stub) -> None:
+    """
+    Test that a change of the file's mtime invalidates its cached responses
+    """
+    server = make_server(repo)
+    await server.request_definition("contract.sol", 0, 9)
+    mtime = os.stat(repo / "contract.sol").st_mtime_ns + 1_000_000_000
+    os.utime(repo / "contract.sol", ns=(mtime, mtime))
+    await server.request_definition("contract.sol", 0, 9)
+    assert len(stub.calls) == 2
+
+
+async def test_edited_buffer_is_requested_again(repo, stub) -> None:
+    """
+    Test that an unsaved edit of the open buffer invalidates the cached responses
+    """
+    server = make_server(repo)
+    uri = pathlib.Path(repo, "contract.sol").as_uri()
+    server.open_file_buffers[uri] = LSPFileBuffer(uri, "contract A {}\n", 0, "solidity", 1)
+    await server.request_definition("contract.sol", 0, 9)
+    await server.request_definition("contract.sol", 0, 9)
+    assert len(stub.calls) == 1
+
+    server.open_file_buffers[uri].contents = "contract B {}\n"
+    await server.request_definition("contract.sol", 0, 9)
+    assert len(stub.calls) == 2
+
+
+async def test_reopened_buffer_with_other_edit_is_requested_again(repo, stub) -> None:
+    """
+    Test that a different edit of a reopened file, which restarts from the same buffer version, is not served the
+    response cached for the first edit
+    """
+    server = make_server(repo)
+    server.server_started = True
+    server.server.notify = SimpleNamespace(
+        did_open_text_document=lambda params: None,
+        did_change_text_document=lambda params: None,
+        did_close_text_document=lambda params: None,
+    )
+
+    with server.open_file("contract.sol"):
+        server.insert_text_at_position("contract.sol", 0, 0, "// first\n")
+        await server.request_definition("contract.sol", 1, 9)
+    # Dropping the buffers, as LanguageServer does when it stops, makes the next open_file start again at version 0
+    server.open_file_buffers.clear()
+    with server.open_file("contract.sol"):
+        server.insert_text_at_position("contract.sol", 0, 0, "// second\n")
+        await server.request_definition("contract.sol", 1, 9)
+    assert len(stub.calls) == 2
+
+
+async def test_least_recently_used_entry_is_evicted(repo, stub, monkeypatch) -> None:
+    """
+    Test that the least recently used response is dropped once the cache is full
+    """
+    monkeypatch.setattr(solidity_language_server, "_RESPONSE_CACHE_SIZE", 2)
+    server = make_server(repo)
+    await server.request_definition("contract.sol", 0, 1)
+    await server.request_definition("contract.sol", 0, 2)
+    await server.request_definition("contract.sol", 0, 1)
+    await server.request_definition("contract.sol", 0, 3)
+    assert len(stub.calls) == 3
+
+    await server.request_definition("contract.sol", 0, 1)
+    assert len(stub.calls) == 3
+    await server.request_definition("contract.sol", 0, 2)
+    assert len(stub.calls) == 4
+
+
+async def test_failed_request_is_not_cached(repo, stub) -> None:
+    """
+    Test that a failed request is sent again by the next caller
+    """
+    server = make_server(repo)
+    stub.fail_next = True
+    with pytest.raises(RuntimeError):
+        await server.request_definition("contract.sol", 0, 9)
+    assert await server.request_definition("contract.sol", 0, 9)
+    assert len(stub.calls) == 2
+    assert server._inflight_requests == {}
+
+
+async def test_concurrent_requests_are_coalesced(repo, stub) -> None:
+    """
+    Test that identical requests made while one is in flight wait for it instead of reaching the server
+    """
+    server = make_server(repo)
+    stub.release = asyncio.Event()
+    waiters = [asyncio.ensure_future(server.request_definition("contract.sol", 0, 9)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    stub.release.set()
+    results = await asyncio.gather(*waiters)
+    assert len(stub.calls) == 1
+    assert results[0] == results[1] == results[2]
+
+
+async def test_cancelled_waiter_does_not_cancel_request(repo, stub) -> None:
+    """
+    Test that cancelling one caller leaves the shared request running for the others
+    """
+    server = make_server(repo)
+    stub.release = asyncio.Event()
+    cancelled = asyncio.ensure_future(server.request_definition("contract.sol", 0, 9))
+    other = asyncio.ensure_future(server.request_definition("contract.sol", 0, 9))
+    await asyncio.sleep(0.05)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    stub.release.set()
+
+    assert await other
+    assert cancelled.cancelled()
+    assert len(stub.calls) == 1
+    assert len(server._response_cache) == 1
+
+
+async def test_returned_results_are_copies(repo, stub) -> None:
+    """
+    Test that mutating a returned location does not change what later callers receive
+    """
+    server = make_server(repo)
+    first = await server.request_definition("contract.sol", 0, 9)
+    first[0]["range"]["start"]["line"] = 42
+    first.append({})
+
+    second = await server.request_definition("contract.sol", 0, 9)
+    assert len(second) == 1
+    assert second[0]["range"]["start"]["line"] == 0
+    assert len(stub.calls) == 1
@@ -0,0 +1,324 @@
+"""
+This file contains offline tests for the runtime dependency setup of the Solidity language server.
+The vscode-solidity download is replaced by a prepared directory, and npm by a stub script.
+"""
+
+import json
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from multilspy.language_servers.solidity_language_server import solidity_language_server
+from multilspy.language_servers.solidity_language_server.solidity_language_server import SolidityLanguageServer
+from multilspy.multilspy_config import MultilspyConfig
+from multilspy.multilspy_logger import MultilspyLogger
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="the stub npm is a POSIX shell script")
+
+SERVER_SCRIPT = "out/src/server.js"
+
+
+@pytest.fixture
+def setup_env(tmp_path, monkeypatch):
+    """
+    Prepares an extracted vscode-solidity directory under tmp_path and a stub npm that counts its invocations.
+    Returns the install directory and the dependency spec for it.
+    """
+    ls_dir = tmp_path / "vscode-solidity"
+    extraction_path = ls_dir / "extension"
+    extraction_path.mkdir(parents=True)
+    (extraction_path / "package.json").write_text(json.dumps({"name": "stub", "version": "1.0.0"}))
+
+    npm_calls = tmp_path / "npm_calls"
+    npm = tmp_path / "npm"
+    npm.write_text(
+        "#!/bin/sh\n"
+        f"echo install >> '{npm_calls}'\n"
+        "mkdir -p node_modules/dep\n"
+        "echo 'added 1 package'\n"
+    )
+    npm.chmod(npm.stat().st_mode | stat.S_IEXEC)
+    tools = {"node": sys.executable, "npm": str(npm)}
+    monkeypatch.setattr(solidity_language_server, "_which", lambda name: tools.get(name))
+
+    dependency = {
+        "platformId": "linux-x64",
+        "url": "http://127.0.0.1:1/unused.zip",
+        "archiveType": "zip",
+        "relative_extraction_path": "extension",
+        "serverScript": SERVER_SCRIPT,
+        "npmInstallDirs": ["."],
+        "compileCommand": "mkdir -p out/src && touch out/src/server.js",
+    }
+    return ls_dir, dependency, npm_calls
+
+
+def npm_install_count(npm_calls) -> int:
+    return len(npm_calls.read_text().splitlines()) if npm_calls.exists() else 0
+
+
+def make_server(verbose: bool = False) -> SolidityLanguageServer:
+    config = MultilspyConfig.from_dict({"code_language": "solidity"})
+    return SolidityLanguageServer(config, MultilspyLogger(verbose=verbose), os.getcwd())
+
+
+@pytest.mark.parametrize("verbose", [False, True])
+async def test_hung_command_times_out(setup_env, monkeypatch, verbose) -> None:
+    """
+    Test that a build command exceeding _COMMAND_TIMEOUT is killed, with and without logging enabled
+    """
+    ls_dir, dependency, _ = setup_env
+    monkeypatch.setattr(solidity_language_server, "_COMMAND_TIMEOUT", 1)
+    dependency["npmInstallDirs"] = []
+    dependency["compileCommand"] = "echo building && sleep 30"
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError):
+        make_server(verbose)._install_runtime_dependencies(MultilspyLogger(verbose=verbose), dependency, str(ls_dir))
+    assert time.monotonic() - start < 15
+
+
+@pytest.fixture
+def setup_runtime(setup_env, monkeypatch):
+    """
+    Points setup_runtime_dependencies at the prepared install directory, with an empty in-process setup cache.
+    Returns the install directory, the dependency spec and the list of install runs.
+    """
+    ls_dir, dependency, _ = setup_env
+    platform_id = solidity_language_server._cached_platform_id().value
+    dependency["platformId"] = platform_id
+    monkeypatch.setattr(solidity_language_server, "_SOLIDITY_LS_DIR", str(ls_dir))
+    monkeypatch.setattr(solidity_language_server, "_load_runtime_deps", lambda: {platform_id: dependency})
+    monkeypatch.setattr(solidity_language_server, "_SETUP_CACHE", {})
+
+    installs = []
+    install = SolidityLanguageServer._install_runtime_dependencies
+
+    def counting_install(self, logger, dependency, solidity_ls_dir):
+        installs.append(solidity_ls_dir)
+        return install(self, logger, dependency, solidity_ls_dir)
+
+    monkeypatch.setattr(SolidityLanguageServer, "_install_runtime_dependencies", counting_install)
+    return ls_dir, dependency, installs
+
+
+def setup_in_new_process(server: SolidityLanguageServer):
+    """
+    Runs the setup as a new process would, without the in-process setup cache
+    """
+    solidity_language_server._SETUP_CACHE.clear()
+    return server.setup_runtime_dependencies(server.logger)
+
+
+async def test_ready_marker_skips_setup(setup_runtime) -> None:
+    """
+    Test that the ready marker written by a successful setup lets the next process skip the setup
+    """
+    ls_dir, dependency, installs = setup_runtime
+    server = make_server()
+    command = setup_in_new_process(server)
+    server_script_path = str(ls_dir / "extension" / "out" / "src" / "server.js")
+    assert command == [sys.executable, server_script_path, "--stdio"]
+
+    with open(ls_dir / ".multilspy_ready.json") as f:
+        ready = json.load(f)
+    assert ready == {
+        "version": solidity_language_server._dependency_version(dependency),
+        "serverScript": server_script_path,
+    }
+
+    assert setup_in_new_process(server) == command
+    assert len(installs) == 1
+
+
+async def test_ready_marker_version_mismatch(setup_runtime) -> None:
+    """
+    Test that a marker written for a different dependency spec falls back to the full setup
+    """
+    _, dependency, installs = setup_runtime
+    server = make_server()
+    setup_in_new_process(server)
+    dependency["url"] = "http://127.0.0.1:1/other.zip"
+    setup_in_new_process(server)
+    assert len(installs) == 2
+
+
+@pytest.mark.parametrize("contents", [b"", b"{not json", b"[]", b'{"version": 1}', b"\xff\xfe"])
+async def test_corrupt_ready_marker_is_ignored(setup_runtime, contents) -> None:
+    """
+    Test that an unreadable marker falls back to the full setup, which replaces it
+    """
+    ls_dir, _, installs = setup_runtime
+    server = make_server()
+    setup_in_new_process(server)
+    (ls_dir / ".multilspy_ready.json").write_bytes(contents)
+
+    setup_in_new_process(server)
+    assert len(installs) == 2
+    setup_in_new_process(server)
+    assert len(installs) == 2
+
+
+async def test_ready_marker_with_missing_server_script_is_ignored(setup_runtime) -> None:
+    """
+    Test that a marker pointing at a missing server script falls back to the full setup
+    """
+    ls_dir, _, installs = setup_runtime
+    server = make_server()
+    setup_in_new_process(server)
+
+    os.remove(ls_dir / "extension" / "out" / "src" / "server.js")
+    setup_in_new_process(server)
+    assert len(installs) == 2
+    assert (ls_dir / "extension" / "out" / "src" / "server.js").exists()
+
+
+@pytest.mark.parametrize(
+    "ready",
+    [
+        {"serverScript": "server.js"},
+        {"version": "v1"},
+        {"version": "v1", "serverScript": 1},
+        {"version": "v1", "serverScript": ["server.js"]},
+        {"version": "v1", "cmd": [], "serverScript": None},
+    ],
+)
+def test_malformed_ready_marker_is_ignored(tmp_path, ready) -> None:
+    """
+    Test that a marker with missing or mistyped fields is treated as absent
+    """
+    marker_path = tmp_path / ".multilspy_ready.json"
+    marker_path.write_text(json.dumps(ready))
+    assert solidity_language_server._read_ready_marker(str(marker_path), "v1") is None
+
+
+async def test_node_is_resolved_on_every_setup(setup_runtime, monkeypatch, tmp_path) -> None:
+    """
+    Test that a different node on PATH is picked up without a new setup, both within the process and across
+    processes, including from a marker that still records the node of an older setup
+    """
+    ls_dir, dependency, installs = setup_runtime
+    server = make_server()
+    server_script_path = setup_in_new_process(server)[1]
+
+    other_node = str(tmp_path / "other-node")
+    monkeypatch.setattr(solidity_language_server, "_which", lambda name: other_node if name == "node" else None)
+    assert server.setup_runtime_dependencies(server.logger) == [other_node, server_script_path, "--stdio"]
+    assert setup_in_new_process(server) == [other_node, server_script_path, "--stdio"]
+
+    marker_path = ls_dir / ".multilspy_ready.json"
+    legacy = {
+        "version": solidity_language_server._dependency_version(dependency),
+        "cmd": [sys.executable, server_script_path, "--stdio"],
+        "serverScript": server_script_path,
+    }
+    marker_path.write_text(json.dumps(legacy))
+    assert setup_in_new_process(server) == [other_node, server_script_path, "--stdio"]
+    assert len(installs) == 1
+
+    monkeypatch.setattr(solidity_language_server, "_which", lambda name: None)
+    with pytest.raises(RuntimeError):
+        setup_in_new_process(server)
+
+
+async def test_ready_marker_write_is_atomic(tmp_path, monkeypatch) -> None:
+    """
+    Test that a failed write leaves the previous marker intact and no temporary file behind
+    """
+    marker_path = str(tmp_path / ".multilspy_ready.json")
+    solidity_language_server._write_ready_marker(marker_path, "v1", "server.js")
+    previous = (tmp_path / ".multilspy_ready.json").read_bytes()
+
+    def failing_dumps(obj):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(solidity_language_server, "_json_dumps", failing_dumps)
+    with pytest.raises(OSError):
+        solidity_language_server._write_ready_marker(marker_path, "v2", "server.js")
+
+    assert (tmp_path / ".multilspy_ready.json").read_bytes() == previous
+    assert os.listdir(tmp_path) == [".multilspy_ready.json"]
+
+
+def install(ls_dir, dependency) -> None:
+    make_server()._install_runtime_dependencies(MultilspyLogger(), dependency, str(ls_dir))
+
+
+def test_package_manifest_digest(tmp_path) -> None:
+    """
+    Test that the manifest digest changes with package.json and package-lock.json, and only with them
+    """
+    (tmp_path / "package.json").write_text('{"name": "a"}')
+    digest = solidity_language_server._package_manifest_digest(str(tmp_path))
+    assert solidity_language_server._package_manifest_digest(str(tmp_path)) == digest
+
+    (tmp_path / "README.md").write_text("unrelated")
+    assert solidity_language_server._package_manifest_digest(str(tmp_path)) == digest
+
+    (tmp_path / "package-lock.json").write_text('{"lockfileVersion": 3}')
+    with_lock = solidity_language_server._package_manifest_digest(str(tmp_path))
+    assert with_lock != digest
+
+    (tmp_path / "package.json").write_text('{"name": "b"}')
+    assert solidity_language_server._package_manifest_digest(str(tmp_path)) not in (digest, with_lock)
+
+
+async def test_install_marker_skips_npm_install(setup_env) -> None:
+    """
+    Test that npm install is skipped while node_modules is populated and the manifests match the marker
+    """
+    ls_dir, dependency, npm_calls = setup_env
+    install_path = ls_dir / "extension"
+    install(ls_dir, dependency)
+    assert npm_install_count(npm_calls) == 1
+    marker = (install_path / ".multilspy_install_ok").read_text()
+    assert marker == solidity_language_server._package_manifest_digest(str(install_path))
+
+    install(ls_dir, dependency)
+    assert npm_install_count(npm_calls) == 1
+
+
+async def test_changed_manifest_reinstalls(setup_env) -> None:
+    """
+    Test that a changed package.json or package-lock.json triggers npm install again
+    """
+    ls_dir, dependency, npm_calls = setup_env
+    install_path = ls_dir / "extension"
+    install(ls_dir, dependency)
+
+    (install_path / "package.json").write_text(json.dumps({"name": "stub", "version": "2.0.0"}))
+    install(ls_dir, dependency)
+    assert npm_install_count(npm_calls) == 2
+
+    (install_path / "package-lock.json").write_text(json.dumps({"lockfileVersion": 3}))
+    install(ls_dir, dependency)
+    assert npm_install_count(npm_calls) == 3
+    assert (install_path / ".multilspy_install_ok").read_text() == solidity_language_server._package_manifest_digest(
+        str(install_path)
+    )
+
+
+async def test_empty_node_modules_reinstalls(setup_env) -> None:
+    """
+    Test that a matching marker does not skip npm install when node_modules is empty
+    """
+    ls_dir, dependency, npm_calls = setup_env
+    install_path = ls_dir / "extension"
+    install(ls_dir, dependency)
+
+    (install_path / "node_modules" / "dep").rmdir()
+    install(ls_dir, dependency)
+    assert npm_install_count(npm_calls) == 2
+
+
+async def test_populated_node_modules_without_marker_is_kept(setup_env) -> None:
+    """
+    Test that an install predating the marker, with a populated node_modules, is not redone
+    """
+    ls_dir, dependency, npm_calls = setup_env
+    (ls_dir / "extension" / "node_modules" / "dep").mkdir(parents=True)
+    install(ls_dir, dependency)
+    assert npm_install_count(npm_calls) == 0
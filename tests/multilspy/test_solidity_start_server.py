@@ -0,0 +1,181 @@
+"""
+This file contains offline tests for SolidityLanguageServer.start_server, using a stub LSP server in place of the
+Solidity language server
+"""
+
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from multilspy import SyncLanguageServer
+from multilspy.language_servers.solidity_language_server import nomic_project_setup, solidity_language_server
+from multilspy.language_servers.solidity_language_server.solidity_language_server import (
+    SolidityLanguageServer,
+    _LSPProcessPool,
+)
+from multilspy.multilspy_config import MultilspyConfig
+from multilspy.multilspy_logger import MultilspyLogger
+from solidity_stub_server import wait_for_exit, write_stub_server
+
+
+class RecordingLogger(MultilspyLogger):
+    """
+    Keeps the messages logged through it, so that tests can tell which server instance handled a notification
+    """
+
+    def __init__(self) -> None:
+        super().__init__(verbose=True)
+        self.messages: List[str] = []
+
+    def log(self, debug_message: str, level: int, sanitized_error_message: str = "") -> None:
+        self.messages.append(debug_message)
+
+
+def make_server(repo, logger: MultilspyLogger = None, **options) -> SolidityLanguageServer:
+    config = MultilspyConfig.from_dict({"code_language": "solidity", **options})
+    return SolidityLanguageServer(config, logger or MultilspyLogger(), str(repo))
+
+
+@pytest.fixture
+def stub_setup(tmp_path, monkeypatch):
+    """
+    Makes the setup of SolidityLanguageServer launch the stub server, with an empty process pool.
+    Returns the pool.
+    """
+    stub_server_cmd = write_stub_server(tmp_path)
+    monkeypatch.setattr(SolidityLanguageServer, "setup_runtime_dependencies", lambda self, logger: stub_server_cmd)
+    pool = _LSPProcessPool()
+    monkeypatch.setattr(solidity_language_server, "_PROCESS_POOL", pool)
+    return pool
+
+
+async def test_setup_runs_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    """
+    Test that the runtime and Nomic project setups run in a worker thread, leaving the event loop responsive
+    """
+    stub_server_cmd = write_stub_server(tmp_path)
+    setup_threads = []
+
+    def setup_runtime_dependencies(self, logger):
+        setup_threads.append(threading.get_ident())
+        time.sleep(0.2)
+        return stub_server_cmd
+
+    def setup_project_dependencies(logger, repository_root_path):
+        setup_threads.append(threading.get_ident())
+        time.sleep(0.2)
+
+    monkeypatch.setattr(SolidityLanguageServer, "setup_runtime_dependencies", setup_runtime_dependencies)
+    monkeypatch.setattr(nomic_project_setup, "setup_project_dependencies", setup_project_dependencies)
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.ensure_future(tick())
+    try:
+        async with make_server(tmp_path, enable_nomic_lsp_setup=True).start_server() as server:
+            assert server.server.process_launch_info.cmd == stub_server_cmd
+    finally:
+        ticker.cancel()
+
+    assert len(setup_threads) == 2
+    assert threading.get_ident() not in setup_threads
+    assert ticks >= 10
+
+
+async def test_pooled_process_is_reused(tmp_path, stub_setup) -> None:
+    """
+    Test that a second start_server takes over the process released by the first, without initializing it again,
+    and that the requests and notifications of the reused process are handled by the second instance
+    """
+    pool = stub_setup
+    first = make_server(tmp_path, pool_solidity_lsp_processes=True)
+    async with first.start_server():
+        await first.server.send_request("stub/register", {"id": "first"})
+        stats = await first.server.send_request("stub/stats")
+        handler = first.server
+    assert stats["initializeCount"] == 1
+    assert first._registered_capabilities == {"first": "workspace/stub"}
+    assert len(pool._idle) == 1
+
+    logger = RecordingLogger()
+    second = make_server(tmp_path, logger, pool_solidity_lsp_processes=True)
+    async with second.start_server():
+        assert second.server is handler
+        assert pool._idle == {}
+        assert await second.server.send_request("stub/stats") == stats
+        assert second._registered_capabilities == {"first": "workspace/stub"}
+
+        await second.server.send_request("stub/register", {"id": "second"})
+        assert second._registered_capabilities == {"first": "workspace/stub", "second": "workspace/stub"}
+        assert "second" not in first._registered_capabilities
+        assert "LSP log (info): registering second" in logger.messages
+    assert len(pool._idle) == 1
+
+    await SolidityLanguageServer.close_pooled_processes()
+    assert pool._idle == {}
+    assert await asyncio.get_running_loop().run_in_executor(None, wait_for_exit, stats["pid"])
+
+
+async def test_unpooled_process_is_shut_down(tmp_path, stub_setup) -> None:
+    """
+    Test that without pooling the process is shut down on exit and nothing is released to the pool
+    """
+    pool = stub_setup
+    async with make_server(tmp_path).start_server() as server:
+        pid = (await server.server.send_request("stub/stats"))["pid"]
+    assert pool._idle == {}
+    assert await asyncio.get_running_loop().run_in_executor(None, wait_for_exit, pid)
+
+
+def test_sync_language_server_does_not_pool(tmp_path, stub_setup) -> None:
+    """
+    Test that a process started through SyncLanguageServer is shut down on exit instead of being pooled, as the event
+    loop of a SyncLanguageServer is stopped as soon as its server exits
+    """
+    pool = stub_setup
+
+    async def create():
+        return make_server(tmp_path, pool_solidity_lsp_processes=True)
+
+    sync_server = SyncLanguageServer(asyncio.run(create()))
+    with sync_server.start_server():
+        stats = asyncio.run_coroutine_threadsafe(
+            sync_server.language_server.server.send_request("stub/stats"), sync_server.loop
+        ).result(timeout=30)
+    assert pool._idle == {}
+    assert wait_for_exit(stats["pid"])
+
+
+async def test_hung_shutdown_is_abandoned(tmp_path, stub_setup, monkeypatch) -> None:
+    """
+    Test that exiting start_server does not fail when the shutdown request times out and stop() returns before the
+    cancelled shutdown has unwound
+    """
+    monkeypatch.setattr(solidity_language_server, "_SHUTDOWN_TIMEOUT", 0.1)
+
+    async def hung_shutdown():
+        await asyncio.Event().wait()
+
+    async with make_server(tmp_path).start_server() as server:
+        handler = server.server
+        stop = handler.stop
+        pid = handler.process.pid
+
+        async def stop_without_yielding():
+            process, handler.process = handler.process, None
+            handler._signal_process_tree(process, terminate=False)
+
+        handler.shutdown = hung_shutdown
+        handler.stop = stop_without_yielding
+
+    await stop()
+    assert await asyncio.get_running_loop().run_in_executor(None, wait_for_exit, pid)